@@ -0,0 +1,85 @@
+from constants import *
+from world import np
+
+
+class AreaEffects:
+    """Area damage queued during a tick and applied to enemies in one pass at its end
+
+    Enemies are bucketed once per resolve, so each effect only measures the
+    enemies near it, with squared distances. Enemies the pass kills are
+    awarded once, after every effect has landed.
+    """
+    def __init__(self, sim, cell_size=COLLISION_CELL_SIZE):
+        self.sim = sim
+        self.pending = []
+        self.cell_size = cell_size
+        self.cells = {}  # Enemies bucketed by the cell holding their center
+
+    def emit(self, x, y, radius, damage, exclude=None, blast=None, spark=None):
+        """Queue damage to every enemy within radius of (x, y)
+
+        exclude is an enemy to skip, blast a (color, count) explosion at the center
+        and spark a color for a small explosion on each enemy hit.
+        """
+        self.pending.append((x, y, radius, damage, exclude, blast, spark))
+
+    def resolve(self):
+        """Apply every queued effect, then award the enemies they killed"""
+        if not self.pending:
+            return
+        sim = self.sim
+        effects = self.pending
+        self.pending = []
+
+        enemies = sim.enemies
+        if enemies.vectorized:
+            find = self.find_in_store
+        else:
+            self.bucket(enemies)
+            find = self.find_in_cells
+
+        damaged = {}
+        for x, y, radius, damage, exclude, blast, spark in effects:
+            if blast:
+                sim.create_explosion(x, y, *blast)
+            for enemy in find(x, y, radius):
+                if enemy is exclude:
+                    continue
+                enemy.take_damage(damage)
+                damaged[id(enemy)] = enemy
+                if spark:
+                    sim.create_explosion(enemy.x, enemy.y, spark, 5)
+
+        for enemy in damaged.values():
+            if not enemy.is_alive() and enemy in enemies:
+                sim.award_kill(enemy)
+
+    def bucket(self, enemies):
+        """Rebuild the cells; enemies are points here, their size does not matter"""
+        size = self.cell_size
+        cells = self.cells = {}
+        for enemy in enemies:
+            key = (int(enemy.x // size), int(enemy.y // size))
+            bucket = cells.get(key)
+            if bucket is None:
+                cells[key] = [enemy]
+            else:
+                bucket.append(enemy)
+
+    def find_in_cells(self, x, y, radius):
+        size = self.cell_size
+        cells = self.cells
+        radius_sq = radius * radius
+        found = []
+        for cx in range(int((x - radius) // size), int((x + radius) // size) + 1):
+            for cy in range(int((y - radius) // size), int((y + radius) // size) + 1):
+                for enemy in cells.get((cx, cy), ()):
+                    dx = enemy.x - x
+                    dy = enemy.y - y
+                    if dx * dx + dy * dy < radius_sq:
+                        found.append(enemy)
+        return found
+
+    def find_in_store(self, x, y, radius):
+        enemies = self.sim.enemies
+        return [enemies[slot] for slot in np.flatnonzero(enemies.within(x, y, radius))]
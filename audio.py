@@ -0,0 +1,83 @@
+import math
+import pygame
+
+# Mixer voices shared by every sound effect; background music streams separately
+SOUND_CHANNELS = 8
+
+# Sound name -> (minimum ms between plays, most voices playing it at once)
+SOUND_LIMITS = {
+    'shoot': (60, 2),
+    'hit': (50, 3),
+    'kill': (70, 3),
+    'levelup': (0, 1),
+}
+DEFAULT_SOUND_LIMIT = (50, 2)
+
+# Each doubling of the triggers folded into one play adds this much of the base volume
+COALESCE_GAIN = 0.25
+
+
+class SoundDispatcher:
+    """Plays sound effects on a fixed channel pool, rate limited per sound
+
+    trigger() only counts. update() runs once per frame and plays each
+    triggered sound whose rate-limit window has passed. Every trigger since
+    the sound's last play is coalesced into that one voice, played louder.
+    A sound at its voice limit, or with no free channel, is dropped rather
+    than delayed.
+    """
+    def __init__(self, channels=SOUND_CHANNELS):
+        pygame.mixer.set_num_channels(channels)
+        self.channels = [pygame.mixer.Channel(i) for i in range(channels)]
+        self.sounds = {}  # name -> (Sound, base volume)
+        self.pending = {}  # name -> triggers waiting for the next play
+        self.last_played = {}  # name -> ms of its last play
+        self.voices = {}  # Channel -> name of the sound last started on it
+        self.triggered = 0
+        self.played = 0
+        self.coalesced = 0  # Triggers folded into another trigger's play
+        self.dropped = 0  # Triggers never played
+
+    def add(self, name, sound):
+        """Register a loaded sound; its current volume becomes the volume of a single trigger"""
+        if sound is not None:
+            self.sounds[name] = (sound, sound.get_volume())
+            sound.set_volume(1.0)  # Loudness is set per channel at play time
+
+    def trigger(self, name):
+        if name in self.sounds:
+            self.triggered += 1
+            self.pending[name] = self.pending.get(name, 0) + 1
+
+    def update(self, now):
+        """Play or drop every sound whose rate-limit window has passed"""
+        if not self.pending:
+            return
+        waiting = {}
+        for name, count in self.pending.items():
+            interval, max_voices = SOUND_LIMITS.get(name, DEFAULT_SOUND_LIMIT)
+            last = self.last_played.get(name)
+            if last is not None and now - last < interval:
+                waiting[name] = count  # Folds into the play once the window ends
+                continue
+            channel = self.free_channel()
+            if channel is None or self.voices_playing(name) >= max_voices:
+                self.dropped += count
+                continue
+            sound, volume = self.sounds[name]
+            channel.play(sound)
+            channel.set_volume(min(1.0, volume * (1 + COALESCE_GAIN * math.log2(count))))
+            self.voices[channel] = name
+            self.last_played[name] = now
+            self.played += 1
+            self.coalesced += count - 1
+        self.pending = waiting
+
+    def free_channel(self):
+        for channel in self.channels:
+            if not channel.get_busy():
+                return channel
+        return None
+
+    def voices_playing(self, name):
+        return sum(1 for channel, playing in self.voices.items() if playing == name and channel.get_busy())
@@ -0,0 +1,135 @@
+import math
+from collections import namedtuple
+
+from constants import *
+
+try:
+    import numpy as np
+except ImportError:  # Without numpy volleys are laid out one projectile at a time and hits are tested pairwise
+    np = None
+
+# One boss attack pattern, as data:
+#   every  - fires on every Nth volley of the boss's pattern counter
+#   burst  - projectiles per volley, step radians apart
+#   speed  - pixels per second
+#   aim    - direction of the first projectile: 'fixed' (angle 0), 'spin' (turns
+#            with time and volleys, by spin = (radians per ms, radians per volley)),
+#            'player' (at the turret) or 'random'
+Pattern = namedtuple('Pattern', ['every', 'burst', 'speed', 'step', 'aim', 'spin'],
+                     defaults=(0.0, 'fixed', (0.0, 0.0)))
+
+PATTERNS = {
+    'spiral': Pattern(1, 1, 150, aim='spin', spin=(0.003, 0.4)),
+    'ring': Pattern(30, 8, 150, step=2 * math.pi / 8),
+    'aimed': Pattern(3, 1, 120, aim='player'),
+    'chaos': Pattern(2, 1, 150, aim='random'),
+}
+
+# Bullets per block of the bullets x projectiles hit matrix
+HIT_CHUNK = 256
+
+# Extra reach of the batched broad phase, so float rounding never drops a pair the exact test keeps
+BROAD_PHASE_MARGIN = 1.0
+
+
+def volley_angle(pattern, counter, current_time, origin, target, rng):
+    """Direction of a volley's first projectile, None when the pattern skips this volley"""
+    if counter % pattern.every:
+        return None
+    if pattern.aim == 'spin':
+        per_ms, per_volley = pattern.spin
+        return current_time * per_ms + counter * per_volley
+    if pattern.aim == 'player':
+        dx = target[0] - origin[0]
+        dy = target[1] - origin[1]
+        return math.atan2(dy, dx) if dx or dy else None
+    if pattern.aim == 'random':
+        return rng.uniform(0, math.pi * 2)
+    return 0.0
+
+
+def volley_columns(pattern, angle, origin, delay=0.0):
+    """(x, y, vel_x, vel_y) of every projectile in a volley, each moved back by delay seconds of travel
+
+    Arrays with numpy, lists without.
+    """
+    if np is not None:
+        angles = angle + pattern.step * np.arange(pattern.burst)
+        vel_x = np.cos(angles) * pattern.speed
+        vel_y = np.sin(angles) * pattern.speed
+        return origin[0] - vel_x * delay, origin[1] - vel_y * delay, vel_x, vel_y
+    angles = [angle + pattern.step * i for i in range(pattern.burst)]
+    vel_x = [math.cos(a) * pattern.speed for a in angles]
+    vel_y = [math.sin(a) * pattern.speed for a in angles]
+    return ([origin[0] - vx * delay for vx in vel_x], [origin[1] - vy * delay for vy in vel_y],
+            vel_x, vel_y)
+
+
+def live_columns(population, *names):
+    """(entities, one array per name) for every live entity, in iteration order"""
+    if population.vectorized:
+        slots = np.flatnonzero(population.live_mask())
+        entities = list(map(population.items.__getitem__, slots.tolist()))
+        return (entities,) + tuple(getattr(population, name)[slots] for name in names)
+    entities = list(population)
+    return (entities,) + tuple(np.fromiter((getattr(entity, name) for entity in entities),
+                                           dtype=float, count=len(entities)) for name in names)
+
+
+def sweep_hits(x0, y0, x1, y1, radius, cx, cy, cr):
+    """(path, circle) index pairs where a swept path passes within radius + cr of a circle
+
+    Pairs come ordered by path, then by circle.
+    """
+    paths = []
+    circles = []
+    if len(x0) == 0 or len(cx) == 0:
+        return paths, circles
+    for start in range(0, len(x0), HIT_CHUNK):
+        stop = start + HIT_CHUNK
+        sx = x0[start:stop, np.newaxis]
+        sy = y0[start:stop, np.newaxis]
+        dx = (x1[start:stop] - x0[start:stop])[:, np.newaxis]
+        dy = (y1[start:stop] - y0[start:stop])[:, np.newaxis]
+        length_sq = dx * dx + dy * dy
+        # Closest point of each path to each circle, clamped to the segment
+        t = ((cx - sx) * dx + (cy - sy) * dy) / np.where(length_sq > 0, length_sq, 1)
+        t = np.clip(t, 0.0, 1.0)
+        px = sx + dx * t - cx
+        py = sy + dy * t - cy
+        reach = radius[start:stop, np.newaxis] + cr
+        rows, columns = np.nonzero(px * px + py * py < reach * reach)
+        paths.extend((rows + start).tolist())
+        circles.extend(columns.tolist())
+    return paths, circles
+
+
+def projectile_hits(bullets, projectiles):
+    """Map each bullet whose straight path this tick crossed a projectile to those projectiles, in order"""
+    bullet_list, x0, y0, x1, y1, radius = live_columns(bullets, 'prev_x', 'prev_y', 'x', 'y', 'radius')
+    proj_list, cx, cy, cr = live_columns(projectiles, 'x', 'y', 'radius')
+    hits = {}
+    for path, circle in zip(*sweep_hits(x0, y0, x1, y1, radius, cx, cy, cr)):
+        hits.setdefault(bullet_list[path], []).append(proj_list[circle])
+    return hits
+
+
+def swept_targets(bullets, population, bounced=()):
+    """Slots of the live rows of an EntityStore that some bullet's path this tick came near, in order
+
+    A superset of the rows the exact per-entity test hits: bounced bullets are
+    tested along both legs of their path as well as straight through.
+    """
+    _, x0, y0, x1, y1, radius = live_columns(bullets, 'prev_x', 'prev_y', 'x', 'y', 'radius')
+    legs = [(bullet.prev_x, bullet.prev_y, bullet.bounce_x, bullet.bounce_y, bullet.radius)
+            for bullet in bounced if bullet.bounce_x is not None]
+    legs += [(bullet.bounce_x, bullet.bounce_y, bullet.x, bullet.y, bullet.radius)
+             for bullet in bounced if bullet.bounce_x is not None]
+    if legs:
+        extra = np.array(legs).T
+        x0, y0, x1, y1, radius = (np.concatenate((column, more))
+                                  for column, more in zip((x0, y0, x1, y1, radius), extra))
+    slots = np.flatnonzero(population.live_mask())
+    _, circles = sweep_hits(x0, y0, x1, y1, radius + BROAD_PHASE_MARGIN,
+                            population.x[slots], population.y[slots], population.radius[slots])
+    return np.unique(slots[circles]).tolist()
@@ -0,0 +1,93 @@
+"""Benchmark explosive splash: a full enemy scan per explosion against the batched AreaEffects pass.
+
+Each frame EXPLOSIONS explosive bullets land among ENEMIES enemies; every
+explosion deals splash damage to the enemies within 80 units.
+
+Run from the repository root:
+    python benchmarks/bench_aoe.py
+"""
+import os
+import sys
+import math
+import random
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from constants import *
+from entities import Enemy
+from aoe import AreaEffects
+from world import EntityPool
+
+ENEMY_COUNTS = [200, 1000, 3000]
+EXPLOSION_COUNTS = [10, 40]
+FRAMES = 30
+
+
+class SplashSim:
+    """The parts of Simulation an AreaEffects pass touches"""
+    def __init__(self, enemies):
+        self.enemies = enemies
+        self.kills = 0
+
+    def create_explosion(self, x, y, color, count=15):
+        pass
+
+    def award_kill(self, enemy):
+        self.kills += 1
+        self.enemies.kill(enemy)
+
+
+def make_enemies(count):
+    random.seed(1)
+    enemies = EntityPool(Enemy)
+    for _ in range(count):
+        enemy = enemies.spawn(random.uniform(0, SCREEN_WIDTH), random.uniform(0, SCREEN_HEIGHT), 'square')
+        enemy.hp = enemy.max_hp = 1e9  # Keep the population constant
+    return enemies
+
+
+def make_blasts(explosions):
+    return [[(random.uniform(0, SCREEN_WIDTH), random.uniform(0, SCREEN_HEIGHT)) for _ in range(explosions)]
+            for _ in range(FRAMES)]
+
+
+def run_scan(enemies, blasts):
+    """Splash as the collision loop did it: a sqrt scan over every enemy per explosion"""
+    for frame in blasts:
+        for x, y in frame:
+            for enemy in enemies:
+                dx = enemy.x - x
+                dy = enemy.y - y
+                if math.sqrt(dx**2 + dy**2) < 80:
+                    enemy.take_damage(10)
+
+
+def run_batched(enemies, blasts):
+    """Splash queued during the frame and resolved in one AreaEffects pass"""
+    area_effects = AreaEffects(SplashSim(enemies))
+    for frame in blasts:
+        for x, y in frame:
+            area_effects.emit(x, y, 80, 10)
+        area_effects.resolve()
+
+
+def main():
+    print(f"{FRAMES} frames, ms per frame")
+    print(f"{'enemies':>8} {'blasts':>7} {'scan':>8} {'batched':>8} {'speedup':>8}")
+    for count in ENEMY_COUNTS:
+        for explosions in EXPLOSION_COUNTS:
+            enemies = make_enemies(count)
+            blasts = make_blasts(explosions)
+            start = time.perf_counter()
+            run_scan(enemies, blasts)
+            scan_ms = (time.perf_counter() - start) * 1000 / FRAMES
+            start = time.perf_counter()
+            run_batched(enemies, blasts)
+            batched_ms = (time.perf_counter() - start) * 1000 / FRAMES
+            print(f"{count:>8} {explosions:>7} {scan_ms:>8.2f} {batched_ms:>8.2f} {scan_ms / batched_ms:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Benchmark bullet-vs-enemy collision: brute force against the spatial grid.
+
+Run from the repository root:
+    python benchmarks/bench_collision.py
+"""
+import os
+import sys
+import random
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from constants import *
+from entities import Bullet, Enemy
+from spatial import SpatialGrid
+
+ENTITY_COUNTS = [100, 250, 500, 1000, 2000, 4000]
+FRAMES = 20
+
+
+def make_scene(count, seed=1):
+    """Build enemies and bullets scattered over the screen"""
+    rng = random.Random(seed)
+    types = list(ENEMY_TYPES.keys())
+    enemies = [Enemy(rng.uniform(0, SCREEN_WIDTH), rng.uniform(0, SCREEN_HEIGHT), rng.choice(types))
+               for _ in range(count)]
+    bullets = [Bullet(rng.uniform(0, SCREEN_WIDTH), rng.uniform(0, SCREEN_HEIGHT), 0, 0, BASE_DAMAGE)
+               for _ in range(count)]
+    return enemies, bullets
+
+
+def brute_force_hits(enemies, bullets):
+    """Collision pass as Game.update did it before the grid"""
+    hits = []
+    bullets = bullets[:]
+    for enemy in enemies:
+        for bullet in bullets[:]:
+            if enemy.collides_with_bullet(bullet):
+                hits.append((id(enemy), id(bullet)))
+                bullets.remove(bullet)
+                break
+    return hits
+
+
+def grid_hits(enemies, bullets, grid):
+    """Collision pass using the spatial grid as broad phase"""
+    hits = []
+    grid.rebuild(bullets)
+    for enemy in enemies:
+        for bullet in grid.query(enemy.x, enemy.y, enemy.get_collision_radius()):
+            if enemy.collides_with_bullet(bullet):
+                hits.append((id(enemy), id(bullet)))
+                grid.remove(bullet)
+                break
+    return hits
+
+
+def time_frames(func, *args):
+    """Average milliseconds per call over FRAMES calls"""
+    start = time.perf_counter()
+    for _ in range(FRAMES):
+        result = func(*args)
+    return (time.perf_counter() - start) * 1000 / FRAMES, result
+
+
+def main():
+    grid = SpatialGrid(COLLISION_CELL_SIZE)
+    print(f"Screen {SCREEN_WIDTH}x{SCREEN_HEIGHT}, cell size {COLLISION_CELL_SIZE}, {FRAMES} frames each")
+    print(f"{'entities':>10} {'brute ms':>10} {'grid ms':>10} {'speedup':>8} {'hits':>6}")
+    for count in ENTITY_COUNTS:
+        enemies, bullets = make_scene(count)
+        brute_ms, brute = time_frames(brute_force_hits, enemies, bullets)
+        grid_ms, hits = time_frames(grid_hits, enemies, bullets, grid)
+        if hits != brute:
+            raise SystemExit(f"Grid produced different hits at {count} entities")
+        print(f"{count:>10} {brute_ms:>10.2f} {grid_ms:>10.2f} {brute_ms / grid_ms:>7.1f}x {len(hits):>6}")
+
+
+if __name__ == "__main__":
+    main()
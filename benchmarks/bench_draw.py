@@ -0,0 +1,117 @@
+"""Benchmark the entity draw pass: per-shape pygame.draw calls against the sprite atlas.
+
+Draws COUNT enemies (half of them damaged, so they show HP bars) and a quarter as
+many bullets onto an off-screen surface, first with the pygame.draw calls each
+entity used to make for itself, then with SpriteAtlas batches and one
+Surface.blits() call.
+
+Run from the repository root:
+    python benchmarks/bench_draw.py
+"""
+import os
+import sys
+import random
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+
+from constants import *
+from entities import Bullet, Enemy
+from sprites import SpriteAtlas
+
+ENTITY_COUNTS = [500, 1000, 2000, 4000]
+FRAMES = 60
+
+
+def make_entities(count):
+    random.seed(1)
+    enemies = []
+    for _ in range(count):
+        enemy = Enemy(random.uniform(0, SCREEN_WIDTH), random.uniform(0, SCREEN_HEIGHT),
+                      random.choice(list(ENEMY_TYPES)))
+        if random.random() < 0.5:
+            enemy.hp *= 0.5
+        enemies.append(enemy)
+    bullets = [Bullet(random.uniform(0, SCREEN_WIDTH), random.uniform(0, SCREEN_HEIGHT), 0, 0, 10,
+                      explosive=random.random() < 0.3, homing=random.random() < 0.3)
+               for _ in range(count // 4)]
+    return enemies, bullets
+
+
+def draw_bullet(screen, bullet):
+    """A bullet drawn shape by shape, as before the atlas"""
+    center = (int(bullet.x), int(bullet.y))
+    if bullet.explosive:
+        pygame.draw.circle(screen, ORANGE, center, bullet.radius + 2)
+        pygame.draw.circle(screen, RED, center, bullet.radius)
+    elif bullet.piercing:
+        pygame.draw.circle(screen, CYAN, center, bullet.radius + 1)
+        pygame.draw.circle(screen, WHITE, center, bullet.radius - 1)
+    elif bullet.homing:
+        pygame.draw.circle(screen, MAGENTA, center, bullet.radius + 1)
+        pygame.draw.circle(screen, WHITE, center, bullet.radius - 2)
+    else:
+        pygame.draw.circle(screen, bullet.color, center, bullet.radius)
+
+
+def draw_enemy(screen, enemy):
+    """An enemy and its HP bar drawn shape by shape, as before the atlas"""
+    x, y = enemy.x, enemy.y
+    size = enemy.spec.size
+    if enemy.type == 'circle':
+        pygame.draw.circle(screen, enemy.color, (int(x), int(y)), size)
+        pygame.draw.circle(screen, WHITE, (int(x), int(y)), size, 2)
+    elif enemy.type == 'square':
+        rect = pygame.Rect(int(x - size / 2), int(y - size / 2), size, size)
+        pygame.draw.rect(screen, enemy.color, rect)
+        pygame.draw.rect(screen, WHITE, rect, 2)
+    else:
+        points = [(x, y - size * 0.6), (x - size * 0.5, y + size * 0.4), (x + size * 0.5, y + size * 0.4)]
+        pygame.draw.polygon(screen, enemy.color, points)
+        pygame.draw.polygon(screen, WHITE, points, 2)
+    if enemy.hp < enemy.max_hp:
+        pygame.draw.rect(screen, RED, (x - 20, y - 35, 40, 5))
+        pygame.draw.rect(screen, GREEN, (x - 20, y - 35, 40 * enemy.hp / enemy.max_hp, 5))
+
+
+def draw_shapes(screen, enemies, bullets):
+    for bullet in bullets:
+        draw_bullet(screen, bullet)
+    for enemy in enemies:
+        draw_enemy(screen, enemy)
+
+
+def draw_sprites(screen, atlas, enemies, bullets):
+    blits = []
+    atlas.add_bullets(blits, bullets, 1.0)
+    atlas.add_enemies(blits, enemies, 1.0)
+    screen.blits(blits, doreturn=False)
+
+
+def main():
+    pygame.display.init()
+    pygame.display.set_mode((1, 1))
+    screen = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+    atlas = SpriteAtlas()
+    print(f"{FRAMES} frames on a {SCREEN_WIDTH}x{SCREEN_HEIGHT} surface, ms per frame")
+    print(f"{'enemies':>8} {'bullets':>8} {'shapes':>8} {'atlas':>8} {'speedup':>8}")
+    for count in ENTITY_COUNTS:
+        enemies, bullets = make_entities(count)
+        start = time.perf_counter()
+        for _ in range(FRAMES):
+            screen.fill(BLACK)
+            draw_shapes(screen, enemies, bullets)
+        shapes_ms = (time.perf_counter() - start) * 1000 / FRAMES
+        start = time.perf_counter()
+        for _ in range(FRAMES):
+            screen.fill(BLACK)
+            draw_sprites(screen, atlas, enemies, bullets)
+        atlas_ms = (time.perf_counter() - start) * 1000 / FRAMES
+        print(f"{count:>8} {len(bullets):>8} {shapes_ms:>8.2f} {atlas_ms:>8.2f} {shapes_ms / atlas_ms:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Benchmark memory per live entity: per-instance dicts against __slots__ and shared enemy specs.
+
+Creates COUNT live entities of each class and reports the bytes traced per
+entity, first for a copy of the class with its attributes in a per-instance
+dict (and, for enemies, their own copy of the type's stats as they used to
+carry), then for the class as it is.
+
+Run from the repository root:
+    python benchmarks/bench_memory.py
+"""
+import os
+import sys
+import gc
+import random
+import tracemalloc
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from constants import *
+from entities import Bullet, BossProjectile, Enemy, Particle, Player
+
+COUNT = 5000
+
+
+def unslotted(cls):
+    """The class as it was before __slots__: same methods, attributes in a per-instance dict"""
+    slots = set(cls.__slots__)
+    namespace = {name: value for name, value in vars(cls).items() if name not in slots and name != '__slots__'}
+    return type(cls.__name__, cls.__bases__, namespace)
+
+
+class DictEnemy(unslotted(Enemy)):
+    """Enemy keeping its own copy of the type's stats"""
+    def __init__(self, x, y, enemy_type, difficulty_scale=1.0):
+        super().__init__(x, y, enemy_type, difficulty_scale)
+        self.stats = ENEMY_TYPES[enemy_type].copy()
+        self.color = self.stats['color']
+
+    color = None  # Instance attribute again, shadowing the spec property
+
+
+def make_args(rng):
+    """Constructor arguments per entity class"""
+    x, y = rng.uniform(0, SCREEN_WIDTH), rng.uniform(0, SCREEN_HEIGHT)
+    return {
+        'Enemy': (x, y, rng.choice(list(ENEMY_TYPES))),
+        'Bullet': (x, y, 300.0, 0.0, 10.0),
+        'Particle': (x, y, ORANGE),
+        'BossProjectile': (x, y, 100.0, 50.0),
+        'Player': (x, y),
+    }
+
+
+def bytes_per_entity(cls, name):
+    """Traced bytes per instance, for COUNT instances kept alive in a list"""
+    rng = random.Random(1)
+    args = [make_args(rng)[name] for _ in range(COUNT)]
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    entities = [cls(*entity_args) for entity_args in args]
+    if name == 'Enemy':
+        for enemy in entities:
+            enemy.aim_at(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2)  # Live enemies carry their own velocity
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del entities
+    return (after - before) / COUNT
+
+
+def main():
+    classes = [
+        ('Enemy', DictEnemy, Enemy),
+        ('Bullet', unslotted(Bullet), Bullet),
+        ('Particle', unslotted(Particle), Particle),
+        ('BossProjectile', unslotted(BossProjectile), BossProjectile),
+        ('Player', unslotted(Player), Player),
+    ]
+    print(f"{COUNT} live entities per class, traced bytes per entity")
+    print(f"{'class':<16} {'dict':>8} {'slots':>8} {'saved':>8}")
+    for name, before_cls, after_cls in classes:
+        before = bytes_per_entity(before_cls, name)
+        after = bytes_per_entity(after_cls, name)
+        print(f"{name:<16} {before:>8.0f} {after:>8.0f} {1 - after / before:>7.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Benchmark particle churn on heavy-explosion frames: list.remove against EntityPool.
+
+Each frame spawns EXPLOSIONS bursts of PARTICLES_PER_EXPLOSION particles, steps
+every particle and removes the expired ones.
+
+Run from the repository root:
+    python benchmarks/bench_removal.py
+"""
+import os
+import sys
+import random
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from constants import *
+from entities import Particle
+from world import EntityPool
+
+EXPLOSION_COUNTS = [5, 10, 20, 40]
+PARTICLES_PER_EXPLOSION = 50
+FRAMES = 120
+DT = 1 / FPS
+
+
+def run_list(explosions):
+    """Particle loop as Game.update did it with list.remove over a [:] copy"""
+    random.seed(1)
+    particles = []
+    for _ in range(FRAMES):
+        for _ in range(explosions):
+            for _ in range(PARTICLES_PER_EXPLOSION):
+                particles.append(Particle(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2, ORANGE))
+        for particle in particles[:]:
+            particle.update(DT)
+            if particle.is_dead():
+                particles.remove(particle)
+    return len(particles)
+
+
+def run_pool(explosions):
+    """Particle loop with dead-marking, one compaction per frame and recycled particles"""
+    random.seed(1)
+    particles = EntityPool(Particle)
+    for _ in range(FRAMES):
+        for _ in range(explosions):
+            for _ in range(PARTICLES_PER_EXPLOSION):
+                particles.spawn(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2, ORANGE)
+        for particle in particles:
+            particle.update(DT)
+            if particle.is_dead():
+                particles.kill(particle)
+        particles.compact()
+    return len(particles), particles.hit_rate
+
+
+def main():
+    print(f"{FRAMES} frames, {PARTICLES_PER_EXPLOSION} particles per explosion")
+    print(f"{'explosions':>10} {'live':>7} {'list ms':>9} {'pool ms':>9} {'speedup':>8} {'reused':>7}")
+    for explosions in EXPLOSION_COUNTS:
+        start = time.perf_counter()
+        live_list = run_list(explosions)
+        list_ms = (time.perf_counter() - start) * 1000 / FRAMES
+        start = time.perf_counter()
+        live_pool, hit_rate = run_pool(explosions)
+        pool_ms = (time.perf_counter() - start) * 1000 / FRAMES
+        if live_list != live_pool:
+            raise SystemExit(f"Pool kept {live_pool} particles, list kept {live_list}")
+        print(f"{explosions:>10} {live_pool:>7} {list_ms:>9.2f} {pool_ms:>9.2f} {list_ms / pool_ms:>7.1f}x {hit_rate:>7.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,251 @@
+"""Benchmark canned game states against stored baselines.
+
+Each scenario builds a Game in a fixed state, then measures update ticks/sec,
+draw frames/sec and the peak memory traced while building and running it.
+Results are compared with benchmarks/baselines.json, and the run exits with
+status 1 when a scenario has regressed by more than the threshold: slower, or
+using more memory. Baselines depend on the machine, so record your own with
+--save before comparing.
+
+Runs on the SDL dummy video and audio drivers, in the fixed headless arena.
+
+Run from the repository root:
+    python benchmarks/bench_scenarios.py
+    python benchmarks/bench_scenarios.py --save
+    python benchmarks/bench_scenarios.py --only boss_chaos --threshold 0.1
+"""
+import os
+import sys
+import argparse
+import contextlib
+import gc
+import io
+import json
+import math
+import random
+import time
+import tracemalloc
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+os.environ['TURRET_HEADLESS'] = '1'  # Same arena size on every machine
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+
+pygame.init()
+
+from constants import *
+from barrage import PATTERNS, Pattern
+from main import Game
+from modules import Module
+import simulation
+from simulation import ScriptedInput
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines.json')
+REGRESSION_THRESHOLD = 0.2  # Fraction of a baseline a result may lose before failing
+TICKS = 120
+FRAMES = 60
+REPEATS = 3  # Timings keep the best run, the least disturbed by the rest of the machine
+MEMORY_TICKS = 10  # Ticks run under tracemalloc, which is too slow to time
+SEED = 1
+
+
+def scatter_enemies(game, rng, count):
+    """Enemies spread over the arena, clear of the turret so none touch it straight away"""
+    player = game.player
+    reach = math.hypot(game.width, game.height) / 2
+    enemy_types = list(ENEMY_TYPES)
+    for _ in range(count):
+        angle = rng.uniform(0, 2 * math.pi)
+        distance = rng.uniform(200, reach)
+        game.add_enemy(player.x + math.cos(angle) * distance, player.y + math.sin(angle) * distance,
+                       rng.choice(enemy_types))
+
+
+def enemy_swarm(count):
+    def setup(game, rng):
+        scatter_enemies(game, rng, count)
+    return setup
+
+
+def all_modules(game, rng):
+    for module in Module.MODULES:
+        game.player.add_module(module['id'])
+        game.hooks.install(module['id'])
+    scatter_enemies(game, rng, 1000)
+
+
+def boss_chaos(game, rng):
+    """Phase 3 boss stuck on the chaos pattern, with the arena already full of projectiles"""
+    game.start_boss_fight()
+    boss = game.boss
+    boss.hp = boss.max_hp * 0.3
+    boss.get_current_pattern = lambda: 'chaos'
+    for _ in range(1500):
+        angle = rng.uniform(0, 2 * math.pi)
+        distance = rng.uniform(0, 400)
+        speed = rng.uniform(20, 60)
+        game.boss_projectiles.spawn(boss.x + math.cos(angle) * distance, boss.y + math.sin(angle) * distance,
+                                    math.cos(angle) * speed, math.sin(angle) * speed)
+
+
+def boss_barrage(game, rng):
+    """Phase 3 boss firing 16-way spinning rings every volley into a full arena, denser than any real pattern"""
+    boss_chaos(game, rng)
+    # A copy of the table, so the extra pattern stays local to this game
+    game.patterns = dict(PATTERNS, barrage=Pattern(1, 16, 150, step=2 * math.pi / 16, aim='spin', spin=(0.003, 0.25)))
+    game.boss.get_current_pattern = lambda: 'barrage'
+    for _ in range(1500):
+        angle = rng.uniform(0, 2 * math.pi)
+        distance = rng.uniform(0, 600)
+        game.boss_projectiles.spawn(game.boss.x + math.cos(angle) * distance,
+                                    game.boss.y + math.sin(angle) * distance,
+                                    math.cos(angle) * 40, math.sin(angle) * 40)
+
+
+def explosions(count):
+    def per_tick(game, rng):
+        for _ in range(count):
+            x = rng.uniform(0, game.width)
+            y = rng.uniform(0, game.height)
+            game.area_effects.emit(x, y, 80, 10, blast=(ORANGE, 15))
+    return per_tick
+
+
+# name -> (setup, called once on a fresh game; per_tick, called before every tick or None)
+SCENARIOS = {
+    'enemies_500': (enemy_swarm(500), None),
+    'enemies_2000': (enemy_swarm(2000), None),
+    'enemies_5000': (enemy_swarm(5000), None),
+    'all_modules': (all_modules, None),
+    'boss_chaos': (boss_chaos, None),
+    'boss_barrage': (boss_barrage, None),
+    'explosions_40': (enemy_swarm(2000), explosions(40)),
+}
+
+# Scenarios run a second time as '<name>:store', with every population in NumPy arrays (USE_ENTITY_STORE)
+STORE_SCENARIOS = ('enemies_2000', 'enemies_5000', 'all_modules', 'boss_chaos', 'explosions_40')
+if simulation.HAS_NUMPY:
+    SCENARIOS.update({f'{name}:store': SCENARIOS[name] for name in STORE_SCENARIOS})
+
+
+def build(name):
+    """A fresh game in the scenario's state; the turret cannot die or level up"""
+    setup, per_tick = SCENARIOS[name]
+    rng = random.Random(SEED)
+    use_store = simulation.USE_ENTITY_STORE
+    simulation.USE_ENTITY_STORE = name.endswith(':store')
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):  # Sound loading messages
+            game = Game(seed=SEED)
+    finally:
+        simulation.USE_ENTITY_STORE = use_store
+    game.input = ScriptedInput(aim=(game.width, game.height / 2), firing=True)
+    game.player.max_hp = game.player.hp = 1e9
+    game.exp_to_next_level = float('inf')
+    setup(game, rng)
+    return game, per_tick, rng
+
+
+def run_ticks(game, per_tick, rng, ticks):
+    dt = 1.0 / SIM_TICK_RATE
+    for _ in range(ticks):
+        if per_tick:
+            per_tick(game, rng)
+        game.step(dt)
+
+
+def measure(name):
+    """Best throughput over REPEATS fresh runs, then the peak memory of one more"""
+    ticks_per_sec = draw_fps = 0
+    for _ in range(REPEATS):
+        game, per_tick, rng = build(name)
+        gc.collect()
+        start = time.perf_counter()
+        run_ticks(game, per_tick, rng, TICKS)
+        ticks_per_sec = max(ticks_per_sec, TICKS / (time.perf_counter() - start))
+
+        start = time.perf_counter()
+        for _ in range(FRAMES):
+            game.draw(1.0)
+        draw_fps = max(draw_fps, FRAMES / (time.perf_counter() - start))
+        del game
+        gc.collect()
+
+    tracemalloc.start()
+    game, per_tick, rng = build(name)
+    run_ticks(game, per_tick, rng, MEMORY_TICKS)
+    game.draw(1.0)
+    peak_kib = tracemalloc.get_traced_memory()[1] / 1024
+    tracemalloc.stop()
+    return {'ticks_per_sec': round(ticks_per_sec, 1), 'draw_fps': round(draw_fps, 1), 'peak_kib': round(peak_kib)}
+
+
+def compare(name, result, baseline, threshold):
+    """Messages for every metric that regressed by more than threshold"""
+    failures = []
+    for metric in ('ticks_per_sec', 'draw_fps'):
+        if result[metric] < baseline[metric] * (1 - threshold):
+            failures.append(f"{name}: {metric} {result[metric]} is more than {threshold:.0%} "
+                            f"below the baseline {baseline[metric]}")
+    if result['peak_kib'] > baseline['peak_kib'] * (1 + threshold):
+        failures.append(f"{name}: peak memory {result['peak_kib']} KiB is more than {threshold:.0%} "
+                        f"above the baseline {baseline['peak_kib']} KiB")
+    return failures
+
+
+def load_baselines(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)['scenarios']
+
+
+def save_baselines(path, results):
+    """Write results as the new baselines, keeping scenarios that were not run"""
+    scenarios = load_baselines(path)
+    scenarios.update(results)
+    with open(path, 'w') as f:
+        json.dump({'arena': [SCREEN_WIDTH, SCREEN_HEIGHT], 'ticks': TICKS, 'frames': FRAMES,
+                   'scenarios': scenarios}, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark canned game states against stored baselines")
+    parser.add_argument('--only', nargs='+', choices=list(SCENARIOS), help="scenarios to run (default: all)")
+    parser.add_argument('--threshold', type=float, default=REGRESSION_THRESHOLD,
+                        help=f"allowed regression as a fraction of the baseline (default: {REGRESSION_THRESHOLD})")
+    parser.add_argument('--baseline', default=BASELINE_PATH, help="baseline file (default: benchmarks/baselines.json)")
+    parser.add_argument('--save', action='store_true', help="store the results as the new baselines")
+    args = parser.parse_args()
+
+    baselines = load_baselines(args.baseline)
+    results = {}
+    failures = []
+    print(f"{TICKS} ticks and {FRAMES} frames per scenario on a {SCREEN_WIDTH}x{SCREEN_HEIGHT} arena")
+    print(f"{'scenario':<20} {'ticks/s':>9} {'base':>9} {'draw fps':>9} {'base':>9} {'peak KiB':>9} {'base':>9}")
+    for name in args.only or SCENARIOS:
+        result = results[name] = measure(name)
+        baseline = baselines.get(name)
+        columns = []
+        for metric in ('ticks_per_sec', 'draw_fps', 'peak_kib'):
+            columns += [result[metric], baseline[metric] if baseline else '-']
+        print(f"{name:<20} " + ' '.join(f"{value:>9}" for value in columns))
+        if baseline and not args.save:
+            failures += compare(name, result, baseline, args.threshold)
+
+    if args.save:
+        save_baselines(args.baseline, results)
+        print(f"Saved baselines to {args.baseline}")
+    elif not baselines:
+        print(f"No baselines at {args.baseline}; run with --save to record them")
+    for failure in failures:
+        print(f"REGRESSION {failure}")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
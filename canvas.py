@@ -0,0 +1,82 @@
+import math
+
+import pygame
+
+from constants import *
+
+
+class Canvas:
+    """Fixed-size logical surface the game draws on, shown in a window of any size
+
+    Three sizes are involved. The logical size is the arena: the game draws and
+    takes input in its coordinates, whatever the monitor. The render size is the
+    display surface the canvas is scaled into, by default the window itself.
+    A smaller render size is opened in SCALED mode, so SDL stretches it to the
+    window on the GPU and fewer pixels go through the CPU scale. Only this class
+    maps between logical and display pixels.
+
+    When the display matches the canvas the game draws straight to it and dirty
+    regions are presented as they are. Otherwise each dirty region is scaled on
+    its own; the whole canvas only on flip().
+    """
+    def __init__(self, logical_size=LOGICAL_SIZE, window_size=WINDOW_SIZE, render_size=RENDER_SIZE,
+                 smooth=SMOOTH_SCALING):
+        if render_size is None or tuple(render_size) == tuple(window_size):
+            self.display = pygame.display.set_mode(window_size)
+        else:
+            self.display = pygame.display.set_mode(render_size, pygame.SCALED)
+            from pygame._sdl2.video import Window
+            Window.from_display_module().size = window_size
+        self.scaled = self.display.get_size() != tuple(logical_size)
+        self.surface = pygame.Surface(logical_size).convert() if self.scaled else self.display
+        self.scale_x = self.display.get_width() / logical_size[0]
+        self.scale_y = self.display.get_height() / logical_size[1]
+        self.smooth = smooth
+        self.scales = 0  # Whole canvases scaled to the display
+        self.rects_scaled = 0  # Dirty regions scaled on their own
+
+    def to_logical(self, pos):
+        """Canvas position of a display position, such as the mouse's"""
+        return (int(pos[0] / self.scale_x), int(pos[1] / self.scale_y))
+
+    def to_display(self, rect):
+        """Display pixels covering a canvas rect, rounded outwards"""
+        left = int(rect.left * self.scale_x)
+        top = int(rect.top * self.scale_y)
+        right = math.ceil(rect.right * self.scale_x)
+        bottom = math.ceil(rect.bottom * self.scale_y)
+        return pygame.Rect(left, top, right - left, bottom - top)
+
+    def scale_region(self, rect):
+        """Scale one canvas rect into the display and return the display rect it covers"""
+        target = self.to_display(pygame.Rect(rect)).clip(self.display.get_rect())
+        if not target:
+            return target
+        # The canvas pixels behind the target, one wider on each side so filtering sees past the edges
+        left = int(target.left / self.scale_x) - 1
+        top = int(target.top / self.scale_y) - 1
+        source = pygame.Rect(left, top,
+                             math.ceil(target.right / self.scale_x) + 1 - left,
+                             math.ceil(target.bottom / self.scale_y) + 1 - top).clip(self.surface.get_rect())
+        origin_x = round(source.left * self.scale_x)
+        origin_y = round(source.top * self.scale_y)
+        size = (round(source.right * self.scale_x) - origin_x, round(source.bottom * self.scale_y) - origin_y)
+        scale = pygame.transform.smoothscale if self.smooth else pygame.transform.scale
+        scaled = scale(self.surface.subsurface(source), size)
+        self.display.blit(scaled, target, target.move(-origin_x, -origin_y))
+        self.rects_scaled += 1
+        return target
+
+    def flip(self):
+        """Present the whole canvas"""
+        if self.scaled:
+            scale = pygame.transform.smoothscale if self.smooth else pygame.transform.scale
+            scale(self.surface, self.display.get_size(), self.display)
+            self.scales += 1
+        pygame.display.flip()
+
+    def update(self, rects):
+        """Present the regions of the canvas that changed"""
+        if self.scaled:
+            rects = [target for target in map(self.scale_region, rects) if target]
+        pygame.display.update(rects)
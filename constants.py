@@ -1,16 +1,51 @@
+import os
 import pygame
 
-# Initialize Pygame
-pygame.init()
-info = pygame.display.Info()
-
-SCREEN_WIDTH = info.current_w
-SCREEN_HEIGHT = info.current_h
 FPS = 60
 
+# Fixed simulation step: gameplay always advances in 1/SIM_TICK_RATE second ticks.
+# A slow frame runs at most MAX_CATCH_UP_TICKS ticks before dropping the backlog.
+SIM_TICK_RATE = 60
+MAX_CATCH_UP_TICKS = 5
+
+# Static menus and the game-over screen are not redrawn; the loop polls input at IDLE_FPS.
+# A frame touching more than DIRTY_RECT_LIMIT regions presents the whole screen instead.
+IDLE_FPS = 15
+DIRTY_RECT_LIMIT = 400
+
+# Frame profiler overlay (F3): percentiles over the last PROFILER_WINDOW frames,
+# re-rendered every PROFILER_REFRESH frames
+PROFILER_WINDOW = 300
+PROFILER_REFRESH = 15
+
 ASPECT_RATIO = 16 / 9
-SCREEN_WIDTH = int(info.current_w * 0.8)  # 80% of the screen width
-SCREEN_HEIGHT = int(SCREEN_WIDTH / ASPECT_RATIO)
+
+# The game is played, drawn and aimed on a fixed logical canvas, the arena, whatever the monitor
+LOGICAL_SIZE = (1536, 864)
+SCREEN_WIDTH, SCREEN_HEIGHT = LOGICAL_SIZE
+
+# Internal render resolution the canvas is scaled to before the window shows it; None renders at
+# the window size. Set TURRET_RESOLUTION=WIDTHxHEIGHT to scale and present fewer pixels at the
+# cost of sharpness; the GPU stretches them to the window.
+RENDER_SIZE = None
+if os.environ.get('TURRET_RESOLUTION'):
+    RENDER_SIZE = tuple(int(side) for side in os.environ['TURRET_RESOLUTION'].lower().split('x'))
+
+# Nearest-neighbour scaling to the window is exact at whole multiples (4K shows the canvas at 2x)
+# and several times cheaper than bilinear, which looks softer but better at odd ratios
+SMOOTH_SCALING = False
+
+# Headless runs (TURRET_HEADLESS=1) never touch the display
+HEADLESS = os.environ.get('TURRET_HEADLESS') == '1'
+
+if HEADLESS:
+    WINDOW_SIZE = LOGICAL_SIZE
+else:
+    # Initialize Pygame
+    pygame.init()
+    info = pygame.display.Info()
+    window_width = int(info.current_w * 0.8)  # 80% of the screen width
+    WINDOW_SIZE = (window_width, int(window_width / ASPECT_RATIO))
 
 # Colors
 BLACK = (0, 0, 0)
@@ -40,6 +75,22 @@ BASE_BULLET_SPEED = 350
 BASE_MAX_HP = 80
 BASE_EXP_MULTIPLIER = 1.0
 
+# Broad-phase collision grid cell size (a few enemy diameters)
+COLLISION_CELL_SIZE = 64
+
+# Homing missiles
+HOMING_RANGE = 300
+HOMING_TURN_RATE = 0.1
+
+# Keep entity positions/velocities in NumPy arrays and step them in bulk (needs numpy)
+USE_ENTITY_STORE = False
+# Boss projectiles get the array store on their own, the bullet-hell phases flood the arena with them
+USE_PROJECTILE_STORE = True
+
+# Entities allocated up front and recycled instead of garbage collected
+PARTICLE_POOL_SIZE = 1024
+BULLET_POOL_SIZE = 256
+
 # Enemy types
 ENEMY_TYPES = {
     'circle': {'color': RED, 'speed': 60, 'hp': 25, 'exp': 10, 'radius': 20},
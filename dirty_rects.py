@@ -0,0 +1,54 @@
+import pygame
+
+from constants import DIRTY_RECT_LIMIT
+
+
+class DirtyRects:
+    """Erases and presents only the screen regions drawn in the last two frames
+
+    Everything is still drawn each frame, but only over the rects the previous
+    frame touched instead of a full-screen fill. Moving things are presented
+    every frame; HUD rects only when the HUD state changes. display is what
+    presents them, pygame.display or a Canvas.
+    """
+    def __init__(self, background, limit=DIRTY_RECT_LIMIT, display=pygame.display):
+        self.background = background
+        self.display = display
+        self.limit = limit
+        self.rects = []  # Moving things drawn last frame
+        self.hud_rects = []  # HUD drawn last frame
+        self.hud_state = None
+        self.full = True
+        self.full_updates = 0
+        self.partial_updates = 0
+        
+    def invalidate(self):
+        """Repaint and present the whole screen next frame"""
+        self.full = True
+        
+    def erase(self, screen):
+        """Clear what the last frame drew, or the whole screen after invalidate()"""
+        if self.full:
+            screen.fill(self.background)
+            return
+        for rect in self.rects:
+            screen.fill(self.background, rect)
+        for rect in self.hud_rects:
+            screen.fill(self.background, rect)
+            
+    def present(self, rects, hud_rects, hud_state):
+        """Push this frame's changes to the display and remember them for the next erase"""
+        rects = [rect for rect in rects if rect]
+        changed = self.rects + rects
+        if hud_state != self.hud_state:
+            changed += self.hud_rects + hud_rects
+        if self.full or len(changed) > self.limit:
+            self.display.flip()
+            self.full_updates += 1
+        else:
+            self.display.update(changed)
+            self.partial_updates += 1
+        self.rects = rects
+        self.hud_rects = hud_rects
+        self.hud_state = hud_state
+        self.full = False
@@ -1,19 +1,51 @@
 import pygame
 import math
 import random
+from collections import namedtuple
 from constants import *
+from render_cache import render_text
+from kinetic import emission_times
+from modifiers import BERSERKER_DAMAGE, BERSERKER_HP_RATIO, apply_downsides, compile_modifiers
+
+
+def segment_hits_circle(x0, y0, x1, y1, cx, cy, radius):
+    """Whether the segment from (x0, y0) to (x1, y1) passes closer than radius to (cx, cy)"""
+    dx = x1 - x0
+    dy = y1 - y0
+    length_sq = dx * dx + dy * dy
+    t = 0.0
+    if length_sq > 0:
+        t = ((cx - x0) * dx + (cy - y0) * dy) / length_sq
+        t = 0.0 if t < 0 else 1.0 if t > 1 else t
+    px = x0 + dx * t - cx
+    py = y0 + dy * t - cy
+    return px * px + py * py < radius * radius
+
+
+def interpolate(entity, alpha):
+    """Position to draw at, between the last two simulation ticks"""
+    return (entity.prev_x + (entity.x - entity.prev_x) * alpha,
+            entity.prev_y + (entity.y - entity.prev_y) * alpha)
 
 
 class Particle:
     """Simple particle for explosion effects"""
-    def __init__(self, x, y, color):
+    __slots__ = ('x', 'y', 'prev_x', 'prev_y', 'vel_x', 'vel_y', 'lifetime', 'age', 'size', 'color', 'pool', 'removed')
+
+    def __init__(self, x, y, color, rng=random):
+        self.reset(x, y, color, rng)
+
+    def reset(self, x, y, color, rng=random):
+        """(Re)initialize the particle, called again when a pool reuses it"""
         self.x = x
         self.y = y
-        self.vel_x = random.uniform(-150, 150)
-        self.vel_y = random.uniform(-150, 150)
-        self.lifetime = random.uniform(0.3, 0.6)
+        self.prev_x = x  # Position at the previous tick, for render interpolation
+        self.prev_y = y
+        self.vel_x = rng.uniform(-150, 150)
+        self.vel_y = rng.uniform(-150, 150)
+        self.lifetime = rng.uniform(0.3, 0.6)
         self.age = 0
-        self.size = random.randint(3, 7)
+        self.size = rng.randint(3, 7)
         self.color = color
         
     def update(self, dt):
@@ -23,15 +55,13 @@ class Particle:
         
     def is_dead(self):
         return self.age >= self.lifetime
-        
-    def draw(self, screen):
-        alpha_ratio = 1 - (self.age / self.lifetime)
-        current_size = int(self.size * alpha_ratio)
-        if current_size > 0:
-            pygame.draw.circle(screen, self.color, (int(self.x), int(self.y)), current_size)
 
 
 class Player:
+    __slots__ = ('x', 'y', 'radius', 'color', 'max_hp', 'hp', 'base_damage', 'damage', 'base_fire_rate',
+                 'fire_rate', 'base_bullet_speed', 'bullet_speed', 'exp_multiplier', 'last_shot_time', 'angle',
+                 'modules', 'modifiers', 'damage_taken_multiplier')
+
     def __init__(self, x, y):
         self.x = x
         self.y = y
@@ -49,53 +79,67 @@ class Player:
         self.last_shot_time = 0
         self.angle = 0
         self.modules = []  # Active modules
+        self.modifiers = compile_modifiers(self.modules)
         self.damage_taken_multiplier = 1.0  # For damage aura downside
         
+    def add_module(self, module_id):
+        """Install a module and apply its downsides"""
+        self.modules.append(module_id)
+        apply_downsides(self, module_id)
+        self.recompile_modifiers()
+        
+    def recompile_modifiers(self):
+        """Rebuild the modifier block, call after modules or upgrades change"""
+        self.modifiers = compile_modifiers(self.modules)
+        
+    def hit_damage(self, damage):
+        """Damage a bullet deals to an enemy; berserker is the only term evaluated per hit"""
+        damage *= self.modifiers.hit_damage
+        if self.modifiers.berserker and self.hp < self.max_hp * BERSERKER_HP_RATIO:
+            damage *= BERSERKER_DAMAGE
+        return damage
+        
     def aim(self, mouse_x, mouse_y):
         """Update turret angle to point at mouse"""
         dx = mouse_x - self.x
         dy = mouse_y - self.y
         self.angle = math.atan2(dy, dx)
         
-    def can_shoot(self, current_time):
-        """Check if enough time has passed to shoot again"""
-        shoot_interval = 1000 / self.fire_rate  # milliseconds between shots
-        return current_time - self.last_shot_time >= shoot_interval
-        
-    def shoot(self, current_time):
-        """Create a bullet in the direction the turret is facing"""
-        if self.can_shoot(current_time):
-            self.last_shot_time = current_time
-            bullet_x = self.x + math.cos(self.angle) * self.radius
-            bullet_y = self.y + math.sin(self.angle) * self.radius
-            vel_x = math.cos(self.angle) * self.bullet_speed
-            vel_y = math.sin(self.angle) * self.bullet_speed
-            
-            # Check for module effects
-            explosive = 'explosive_rounds' in self.modules
-            piercing = 'piercing_rounds' in self.modules
-            homing = 'homing_missiles' in self.modules
-            
-            # Calculate damage with module effects
-            bullet_damage = self.damage
-            if piercing:
-                bullet_damage *= 0.75  # Piercing downside
-            if 'multi_shot' in self.modules:
-                bullet_damage *= 0.7  # Multi-shot downside
-            
-            bullets = [Bullet(bullet_x, bullet_y, vel_x, vel_y, bullet_damage, explosive, piercing, homing)]
-            
-            # Multi-shot module
-            if 'multi_shot' in self.modules:
-                angle_offset = math.pi / 12  # 15 degrees
-                for offset in [-angle_offset, angle_offset]:
-                    angle = self.angle + offset
-                    vel_x2 = math.cos(angle) * self.bullet_speed
-                    vel_y2 = math.sin(angle) * self.bullet_speed
-                    bullets.append(Bullet(bullet_x, bullet_y, vel_x2, vel_y2, bullet_damage, explosive, piercing, homing))
-            
-            return bullets
-        return None
+    def due_shots(self, start, end):
+        """Clock times of every volley the fire rate allows between start and end; marks them fired"""
+        times = emission_times(self.last_shot_time, 1000 / self.fire_rate, start, end)
+        if times:
+            self.last_shot_time = times[-1]
+        return times
+        
+    def volley(self, make_bullet=None):
+        """Bullets of one shot from the muzzle; due_shots() decides when shots happen"""
+        if make_bullet is None:
+            make_bullet = Bullet
+        bullet_x = self.x + math.cos(self.angle) * self.radius
+        bullet_y = self.y + math.sin(self.angle) * self.radius
+        vel_x = math.cos(self.angle) * self.bullet_speed
+        vel_y = math.sin(self.angle) * self.bullet_speed
+        
+        # Module effects and damage downsides come from the compiled modifiers
+        modifiers = self.modifiers
+        explosive = modifiers.explosive
+        piercing = modifiers.piercing
+        homing = modifiers.homing
+        bullet_damage = self.damage * modifiers.shot_damage
+        
+        bullets = [make_bullet(bullet_x, bullet_y, vel_x, vel_y, bullet_damage, explosive, piercing, homing)]
+        
+        # Multi-shot module
+        if modifiers.multi_shot:
+            angle_offset = math.pi / 12  # 15 degrees
+            for offset in [-angle_offset, angle_offset]:
+                angle = self.angle + offset
+                vel_x2 = math.cos(angle) * self.bullet_speed
+                vel_y2 = math.sin(angle) * self.bullet_speed
+                bullets.append(make_bullet(bullet_x, bullet_y, vel_x2, vel_y2, bullet_damage, explosive, piercing, homing))
+        
+        return bullets
         
     def take_damage(self, damage):
         """Reduce HP"""
@@ -108,13 +152,13 @@ class Player:
         return self.hp > 0
         
     def draw(self, screen):
-        """Draw the turret and barrel with improved visuals"""
+        """Draw the turret and barrel with improved visuals, returning the rect it covered"""
         # Draw base shadow
         shadow_offset = 3
-        pygame.draw.circle(screen, (20, 20, 20), (int(self.x + shadow_offset), int(self.y + shadow_offset)), self.radius)
+        bounds = pygame.draw.circle(screen, (20, 20, 20), (int(self.x + shadow_offset), int(self.y + shadow_offset)), self.radius)
         
         # Draw turret base (darker ring)
-        pygame.draw.circle(screen, (30, 80, 100), (int(self.x), int(self.y)), self.radius + 3)
+        bounds.union_ip(pygame.draw.circle(screen, (30, 80, 100), (int(self.x), int(self.y)), self.radius + 3))
         
         # Draw turret body
         pygame.draw.circle(screen, self.color, (int(self.x), int(self.y)), self.radius)
@@ -132,20 +176,30 @@ class Player:
         barrel_length = 35
         end_x = self.x + math.cos(self.angle) * barrel_length
         end_y = self.y + math.sin(self.angle) * barrel_length
-        pygame.draw.line(screen, DARK_GRAY, (self.x, self.y), (end_x, end_y), 8)
+        bounds.union_ip(pygame.draw.line(screen, DARK_GRAY, (self.x, self.y), (end_x, end_y), 8))
         pygame.draw.line(screen, WHITE, (self.x, self.y), (end_x, end_y), 6)
         
         # Draw barrel tip
-        pygame.draw.circle(screen, YELLOW, (int(end_x), int(end_y)), 4)
+        bounds.union_ip(pygame.draw.circle(screen, YELLOW, (int(end_x), int(end_y)), 4))
         
         # Draw turret outline
         pygame.draw.circle(screen, WHITE, (int(self.x), int(self.y)), self.radius, 3)
+        return bounds
 
 
 class Bullet:
+    __slots__ = ('x', 'y', 'prev_x', 'prev_y', 'vel_x', 'vel_y', 'damage', 'radius', 'color', 'explosive',
+                 'piercing', 'homing', 'hits', 'bounces', 'bounce_x', 'bounce_y', 'event_id', 'pool', 'removed')
+
     def __init__(self, x, y, vel_x, vel_y, damage, explosive=False, piercing=False, homing=False):
+        self.reset(x, y, vel_x, vel_y, damage, explosive, piercing, homing)
+
+    def reset(self, x, y, vel_x, vel_y, damage, explosive=False, piercing=False, homing=False):
+        """(Re)initialize the bullet, called again when a pool reuses it"""
         self.x = x
         self.y = y
+        self.prev_x = x
+        self.prev_y = y
         self.vel_x = vel_x
         self.vel_y = vel_y
         self.damage = damage
@@ -155,13 +209,17 @@ class Bullet:
         self.piercing = piercing
         self.homing = homing
         self.hits = 0  # For piercing bullets
+        self.bounces = 0  # For ricochet bullets
+        self.bounce_x = None  # Where the path hit a wall this tick, if it did
+        self.bounce_y = None
+        self.event_id = None  # Despawn entry in a KineticQueue, for straight-line bullets
         
     def update(self, dt, enemies=None):
         """Move the bullet"""
         # Homing behavior
         if self.homing and enemies:
             closest = None
-            closest_dist = 300  # Homing range
+            closest_dist = HOMING_RANGE
             for enemy in enemies:
                 dx = enemy.x - self.x
                 dy = enemy.y - self.y
@@ -177,68 +235,123 @@ class Bullet:
                 target_dist = math.sqrt(target_dx**2 + target_dy**2)
                 if target_dist > 0:
                     speed = math.sqrt(self.vel_x**2 + self.vel_y**2)
-                    turn_rate = 0.1  # How quickly bullet turns
-                    self.vel_x += (target_dx / target_dist * speed - self.vel_x) * turn_rate
-                    self.vel_y += (target_dy / target_dist * speed - self.vel_y) * turn_rate
+                    self.vel_x += (target_dx / target_dist * speed - self.vel_x) * HOMING_TURN_RATE
+                    self.vel_y += (target_dy / target_dist * speed - self.vel_y) * HOMING_TURN_RATE
         
         self.x += self.vel_x * dt
         self.y += self.vel_y * dt
         
-    def is_off_screen(self):
+    def is_off_screen(self, width=SCREEN_WIDTH, height=SCREEN_HEIGHT):
         """Check if bullet has left the screen"""
-        return (self.x < -50 or self.x > SCREEN_WIDTH + 50 or
-                self.y < -50 or self.y > SCREEN_HEIGHT + 50)
-                
-    def draw(self, screen):
-        """Draw the bullet"""
-        if self.explosive:
-            # Explosive bullets are orange/red
-            pygame.draw.circle(screen, ORANGE, (int(self.x), int(self.y)), self.radius + 2)
-            pygame.draw.circle(screen, RED, (int(self.x), int(self.y)), self.radius)
-        elif self.piercing:
-            # Piercing bullets are cyan
-            pygame.draw.circle(screen, CYAN, (int(self.x), int(self.y)), self.radius + 1)
-            pygame.draw.circle(screen, WHITE, (int(self.x), int(self.y)), self.radius - 1)
-        elif self.homing:
-            # Homing bullets are magenta
-            pygame.draw.circle(screen, MAGENTA, (int(self.x), int(self.y)), self.radius + 1)
-            pygame.draw.circle(screen, WHITE, (int(self.x), int(self.y)), self.radius - 2)
-        else:
-            pygame.draw.circle(screen, self.color, (int(self.x), int(self.y)), self.radius)
+        return (self.x < -50 or self.x > width + 50 or
+                self.y < -50 or self.y > height + 50)
+    
+    def exit_time(self, width=SCREEN_WIDTH, height=SCREEN_HEIGHT):
+        """Seconds until a bullet flying straight is off screen, as is_off_screen() sees it"""
+        times = []
+        if self.vel_x:
+            times.append(((width + 50 if self.vel_x > 0 else -50) - self.x) / self.vel_x)
+        if self.vel_y:
+            times.append(((height + 50 if self.vel_y > 0 else -50) - self.y) / self.vel_y)
+        return max(0.0, min(times)) if times else None
+    
+    def bounce(self, width, height, max_bounces):
+        """Reflect off the arena walls, remembering where the path turned; True if it bounced"""
+        if self.bounces >= max_bounces:
+            return False
+        bounced = False
+        if self.x < 0 or self.x > width:
+            wall = 0 if self.x < 0 else width
+            t = (wall - self.prev_x) / (self.x - self.prev_x) if self.x != self.prev_x else 0.0
+            self.bounce_x = wall
+            self.bounce_y = self.prev_y + (self.y - self.prev_y) * t
+            self.x = 2 * wall - self.x
+            self.vel_x = -self.vel_x
+            bounced = True
+        if self.y < 0 or self.y > height:
+            wall = 0 if self.y < 0 else height
+            if not bounced:
+                t = (wall - self.prev_y) / (self.y - self.prev_y) if self.y != self.prev_y else 0.0
+                self.bounce_x = self.prev_x + (self.x - self.prev_x) * t
+                self.bounce_y = wall
+            self.y = 2 * wall - self.y
+            self.vel_y = -self.vel_y
+            bounced = True
+        if bounced:
+            self.bounces += 1
+        return bounced
+    
+    def sweeps_circle(self, cx, cy, radius):
+        """Whether the path moved this tick passed within radius (plus the bullet's) of (cx, cy)"""
+        radius += self.radius
+        if self.bounce_x is None:
+            return segment_hits_circle(self.prev_x, self.prev_y, self.x, self.y, cx, cy, radius)
+        return (segment_hits_circle(self.prev_x, self.prev_y, self.bounce_x, self.bounce_y, cx, cy, radius) or
+                segment_hits_circle(self.bounce_x, self.bounce_y, self.x, self.y, cx, cy, radius))
+    
+    def path_bounds(self):
+        """Bounding box (min_x, min_y, max_x, max_y) of the path moved this tick"""
+        xs = [self.prev_x, self.x]
+        ys = [self.prev_y, self.y]
+        if self.bounce_x is not None:
+            xs.append(self.bounce_x)
+            ys.append(self.bounce_y)
+        r = self.radius
+        return min(xs) - r, min(ys) - r, max(xs) + r, max(ys) + r
+
+
+# Read-only stats of one enemy type, shared by every enemy of that type
+EnemySpec = namedtuple('EnemySpec', [
+    'type', 'color', 'speed', 'hp', 'exp',
+    'size',  # Drawn size: circle radius, square side or triangle height
+    'radius',  # Collision radius
+])
+
+
+def enemy_spec(enemy_type, stats):
+    size = stats.get('size', stats.get('radius', 20))
+    # Squares and triangles collide as a circle slightly smaller than their outline
+    radius = stats['radius'] if enemy_type == 'circle' else size * 0.7
+    return EnemySpec(enemy_type, stats['color'], stats['speed'], stats['hp'], stats['exp'], size, radius)
+
+
+ENEMY_SPECS = {enemy_type: enemy_spec(enemy_type, stats) for enemy_type, stats in ENEMY_TYPES.items()}
 
 
 class Enemy:
+    __slots__ = ('x', 'y', 'prev_x', 'prev_y', 'vel_x', 'vel_y', 'type', 'spec', 'max_hp', 'hp', 'speed',
+                 'exp_reward', 'radius', 'event_id', 'pool', 'removed')
+
     def __init__(self, x, y, enemy_type, difficulty_scale=1.0):
         self.x = x
         self.y = y
+        self.prev_x = x
+        self.prev_y = y
         self.type = enemy_type
-        self.stats = ENEMY_TYPES[enemy_type].copy()
+        self.spec = spec = ENEMY_SPECS[enemy_type]
         
         # Scale stats with difficulty
-        self.max_hp = self.stats['hp'] * difficulty_scale
+        self.max_hp = spec.hp * difficulty_scale
         self.hp = self.max_hp
-        self.speed = self.stats['speed'] * (1 + (difficulty_scale - 1) * 0.3)  # Speed scales slower
-        self.exp_reward = int(self.stats['exp'] * difficulty_scale)
-        self.color = self.stats['color']
-        
-        # Calculate direction toward center
-        center_x, center_y = SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2
-        dx = center_x - self.x
-        dy = center_y - self.y
-        distance = math.sqrt(dx**2 + dy**2)
-        self.vel_x = (dx / distance) * self.speed
-        self.vel_y = (dy / distance) * self.speed
-        
-    def update(self, dt, player):
-        """Move toward player"""
-        # Recalculate direction to follow player
-        dx = player.x - self.x
-        dy = player.y - self.y
+        self.speed = spec.speed * (1 + (difficulty_scale - 1) * 0.3)  # Speed scales slower
+        self.exp_reward = int(spec.exp * difficulty_scale)
+        self.radius = spec.radius
+        self.event_id = None  # Contact entry in a KineticQueue
+        self.vel_x = self.vel_y = 0.0  # Simulation.add_enemy() aims it at the turret
+        
+    def aim_at(self, x, y):
+        """Head straight for (x, y); the turret never moves, so this is done once"""
+        dx = x - self.x
+        dy = y - self.y
         distance = math.sqrt(dx**2 + dy**2)
         if distance > 0:
             self.vel_x = (dx / distance) * self.speed
             self.vel_y = (dy / distance) * self.speed
-            
+        else:
+            self.vel_x = self.vel_y = 0.0
+        
+    def update(self, dt):
+        """Move along the straight line to the turret"""
         self.x += self.vel_x * dt
         self.y += self.vel_y * dt
         
@@ -250,65 +363,28 @@ class Enemy:
         """Check if enemy still has HP"""
         return self.hp > 0
         
-    def collides_with_player(self, player):
-        """Check collision with player"""
-        dx = self.x - player.x
-        dy = self.y - player.y
-        distance = math.sqrt(dx**2 + dy**2)
-        if self.type == 'circle':
-            return distance < (self.stats['radius'] + player.radius)
-        else:
-            # Use approximate collision for square/triangle
-            size = self.stats.get('size', self.stats.get('radius', 20))
-            return distance < (size * 0.7 + player.radius)
-            
+    @property
+    def color(self):
+        return self.spec.color
+        
+    def get_collision_radius(self):
+        """Get the radius used for collision checks"""
+        return self.spec.radius
+        
     def collides_with_bullet(self, bullet):
-        """Check collision with bullet"""
-        dx = self.x - bullet.x
-        dy = self.y - bullet.y
-        distance = math.sqrt(dx**2 + dy**2)
-        if self.type == 'circle':
-            return distance < (self.stats['radius'] + bullet.radius)
-        else:
-            size = self.stats.get('size', self.stats.get('radius', 20))
-            return distance < (size * 0.7 + bullet.radius)
-            
-    def draw(self, screen):
-        """Draw the enemy based on type"""
-        if self.type == 'circle':
-            pygame.draw.circle(screen, self.color, (int(self.x), int(self.y)), self.stats['radius'])
-            pygame.draw.circle(screen, WHITE, (int(self.x), int(self.y)), self.stats['radius'], 2)
-        elif self.type == 'square':
-            size = self.stats['size']
-            rect = pygame.Rect(int(self.x - size/2), int(self.y - size/2), size, size)
-            pygame.draw.rect(screen, self.color, rect)
-            pygame.draw.rect(screen, WHITE, rect, 2)
-        elif self.type == 'triangle':
-            size = self.stats['size']
-            points = [
-                (self.x, self.y - size * 0.6),
-                (self.x - size * 0.5, self.y + size * 0.4),
-                (self.x + size * 0.5, self.y + size * 0.4)
-            ]
-            pygame.draw.polygon(screen, self.color, points)
-            pygame.draw.polygon(screen, WHITE, points, 2)
-            
-        # Draw HP bar
-        if self.hp < self.max_hp:
-            bar_width = 40
-            bar_height = 5
-            bar_x = self.x - bar_width / 2
-            bar_y = self.y - 35
-            hp_ratio = self.hp / self.max_hp
-            pygame.draw.rect(screen, RED, (bar_x, bar_y, bar_width, bar_height))
-            pygame.draw.rect(screen, GREEN, (bar_x, bar_y, bar_width * hp_ratio, bar_height))
+        """Check collision with bullet anywhere along the path it moved this tick"""
+        return bullet.sweeps_circle(self.x, self.y, self.spec.radius)
 
 
 class Boss:
     """Level 30 boss with multiple attack patterns"""
-    def __init__(self, x, y):
+    def __init__(self, x, y, arena_width=SCREEN_WIDTH, arena_height=SCREEN_HEIGHT, rng=random):
         self.x = x
         self.y = y
+        self.prev_x = x
+        self.prev_y = y
+        self.arena_width = arena_width
+        self.arena_height = arena_height
         self.max_hp = 5000
         self.hp = self.max_hp
         self.radius = 60
@@ -322,6 +398,7 @@ class Boss:
         self.rotation = 0
         self.taunt_timer = 0
         self.last_taunt = 0
+        self.rng = rng  # Patterns, teleports and taunts
         
     def update(self, dt, player, current_time):
         """Update boss AI and patterns"""
@@ -349,7 +426,7 @@ class Boss:
             self.vulnerable = False
         
         # Dynamic movement - KITING AWAY from player
-        center_x, center_y = SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2
+        center_x, center_y = self.arena_width / 2, self.arena_height / 2
         time_factor = current_time * 0.001
         
         # Calculate direction AWAY from player
@@ -397,38 +474,39 @@ class Boss:
             
             # Random teleports during vulnerability
             if self.vulnerable and int(time_factor * 10) % 20 == 0:
-                angle = random.uniform(0, math.pi * 2)
+                angle = self.rng.uniform(0, math.pi * 2)
                 self.x = center_x + math.cos(angle) * 200
                 self.y = center_y + math.sin(angle) * 200
         
         # Keep boss on screen
         margin = self.radius + 10
-        self.x = max(margin, min(SCREEN_WIDTH - margin, self.x))
-        self.y = max(margin, min(SCREEN_HEIGHT - margin, self.y))
+        self.x = max(margin, min(self.arena_width - margin, self.x))
+        self.y = max(margin, min(self.arena_height - margin, self.y))
         
     def get_current_pattern(self):
         """Get current bullet pattern based on phase"""
         if self.phase == 1:
-            return random.choice(['spiral', 'ring'])
+            return self.rng.choice(['spiral', 'ring'])
         elif self.phase == 2:
-            return random.choice(['spiral', 'ring', 'aimed'])
+            return self.rng.choice(['spiral', 'ring', 'aimed'])
         else:
-            return random.choice(['spiral', 'ring', 'aimed', 'chaos'])
+            return self.rng.choice(['spiral', 'ring', 'aimed', 'chaos'])
     
-    def should_spawn_projectile(self, dt):
-        """Check if boss should spawn a projectile"""
+    def projectile_times(self, dt, current_time):
+        """Clock times of every projectile volley due in the tick of dt seconds ending at current_time"""
         self.pattern_cooldown -= dt
-        if self.pattern_cooldown <= 0:
-            self.pattern_cooldown = 0.1 / self.phase  # Faster in later phases
-            return True
-        return False
+        times = []
+        while self.pattern_cooldown <= 0:
+            times.append(current_time + self.pattern_cooldown * 1000)
+            self.pattern_cooldown += 0.1 / self.phase  # Faster in later phases
+        return times
     
     def get_taunt(self, current_time):
         """Get random taunt if enough time has passed"""
         if current_time - self.last_taunt > 5000:  # Every 5 seconds
             self.last_taunt = current_time
             from dialogue import BossDialogue
-            return random.choice(BossDialogue.BOSS_TAUNTS)
+            return self.rng.choice(BossDialogue.BOSS_TAUNTS)
         return None
     
     def take_damage(self, damage):
@@ -441,28 +519,29 @@ class Boss:
     def is_alive(self):
         return self.hp > 0
     
-    def draw(self, screen, font):
-        """Draw the boss"""
+    def draw(self, screen, font, alpha=1.0):
+        """Draw the boss, returning the rects of the body and the HP bar"""
+        x, y = interpolate(self, alpha)
         # Draw shadow
-        pygame.draw.circle(screen, (20, 20, 20), (int(self.x + 5), int(self.y + 5)), self.radius)
+        bounds = pygame.draw.circle(screen, (20, 20, 20), (int(x + 5), int(y + 5)), self.radius)
         
         # Draw main body
-        pygame.draw.circle(screen, self.color, (int(self.x), int(self.y)), self.radius)
+        bounds.union_ip(pygame.draw.circle(screen, self.color, (int(x), int(y)), self.radius))
         
         # Draw rotating segments
         for i in range(8):
             angle = self.rotation + (i * math.pi / 4)
-            seg_x = self.x + math.cos(angle) * (self.radius - 10)
-            seg_y = self.y + math.sin(angle) * (self.radius - 10)
+            seg_x = x + math.cos(angle) * (self.radius - 10)
+            seg_y = y + math.sin(angle) * (self.radius - 10)
             pygame.draw.circle(screen, ORANGE if self.vulnerable else DARK_GRAY, 
                              (int(seg_x), int(seg_y)), 8)
         
         # Draw core
         core_color = RED if self.vulnerable else GRAY
-        pygame.draw.circle(screen, core_color, (int(self.x), int(self.y)), 20)
+        pygame.draw.circle(screen, core_color, (int(x), int(y)), 20)
         
         # Draw outline
-        pygame.draw.circle(screen, WHITE, (int(self.x), int(self.y)), self.radius, 4)
+        pygame.draw.circle(screen, WHITE, (int(x), int(y)), self.radius, 4)
         
         # Draw HP bar
         bar_width = 400
@@ -470,39 +549,49 @@ class Boss:
         bar_x = SCREEN_WIDTH / 2 - bar_width / 2
         bar_y = 50
         hp_ratio = self.hp / self.max_hp
-        pygame.draw.rect(screen, DARK_GRAY, (bar_x, bar_y, bar_width, bar_height))
+        bar_rect = pygame.draw.rect(screen, DARK_GRAY, (bar_x, bar_y, bar_width, bar_height))
         pygame.draw.rect(screen, GOLD, (bar_x, bar_y, bar_width * hp_ratio, bar_height))
         pygame.draw.rect(screen, WHITE, (bar_x, bar_y, bar_width, bar_height), 3)
         
-        hp_text = font.render(f"THE SHAPE: {int(self.hp)}/{int(self.max_hp)}", True, WHITE)
+        hp_text = render_text(font, f"THE SHAPE: {int(self.hp)}/{int(self.max_hp)}", WHITE)
         hp_rect = hp_text.get_rect(center=(SCREEN_WIDTH / 2, bar_y + bar_height / 2))
-        screen.blit(hp_text, hp_rect)
+        bar_rect.union_ip(screen.blit(hp_text, hp_rect))
         
         # Vulnerable indicator
         if self.vulnerable:
-            vuln_text = font.render("VULNERABLE!", True, RED)
-            vuln_rect = vuln_text.get_rect(center=(self.x, self.y - self.radius - 20))
-            screen.blit(vuln_text, vuln_rect)
+            vuln_text = render_text(font, "VULNERABLE!", RED)
+            vuln_rect = vuln_text.get_rect(center=(x, y - self.radius - 20))
+            bounds.union_ip(screen.blit(vuln_text, vuln_rect))
+        return [bounds, bar_rect]
 
 
 class BossProjectile:
     """Boss attack projectile - can be shot down"""
+    __slots__ = ('x', 'y', 'prev_x', 'prev_y', 'vel_x', 'vel_y', 'radius', 'color', 'hp', 'pool', 'removed')
+    # Every field but position and velocity starts the same; spawn_many() sets these without reset()
+    SPAWN_FIELDS = {'radius': 8, 'color': RED, 'hp': 2}  # Takes 2 hits to destroy
+
     def __init__(self, x, y, vel_x, vel_y):
+        self.reset(x, y, vel_x, vel_y)
+        
+    def reset(self, x, y, vel_x, vel_y):
+        """(Re)initialise in place so pools can recycle projectiles"""
         self.x = x
         self.y = y
+        self.prev_x = x
+        self.prev_y = y
         self.vel_x = vel_x
         self.vel_y = vel_y
-        self.radius = 8
-        self.color = RED
-        self.hp = 2  # Takes 2 hits to destroy
+        for name, value in self.SPAWN_FIELDS.items():
+            setattr(self, name, value)
         
     def update(self, dt):
         self.x += self.vel_x * dt
         self.y += self.vel_y * dt
         
-    def is_off_screen(self):
-        return (self.x < -50 or self.x > SCREEN_WIDTH + 50 or
-                self.y < -50 or self.y > SCREEN_HEIGHT + 50)
+    def is_off_screen(self, width=SCREEN_WIDTH, height=SCREEN_HEIGHT):
+        return (self.x < -50 or self.x > width + 50 or
+                self.y < -50 or self.y > height + 50)
     
     def collides_with_player(self, player):
         dx = self.x - player.x
@@ -511,23 +600,10 @@ class BossProjectile:
         return distance < (self.radius + player.radius)
     
     def collides_with_bullet(self, bullet):
-        """Check collision with player bullet"""
-        dx = self.x - bullet.x
-        dy = self.y - bullet.y
-        distance = math.sqrt(dx**2 + dy**2)
-        return distance < (self.radius + bullet.radius)
+        """Check collision with player bullet anywhere along the path it moved this tick"""
+        return bullet.sweeps_circle(self.x, self.y, self.radius)
     
     def take_damage(self, damage):
         """Projectile can be shot down"""
         self.hp -= 1
         return self.hp <= 0
-    
-    def draw(self, screen):
-        # Draw with HP indicator
-        if self.hp > 1:
-            pygame.draw.circle(screen, self.color, (int(self.x), int(self.y)), self.radius)
-            pygame.draw.circle(screen, ORANGE, (int(self.x), int(self.y)), self.radius - 3)
-        else:
-            # Damaged state - smaller and darker
-            pygame.draw.circle(screen, DARK_GRAY, (int(self.x), int(self.y)), self.radius)
-            pygame.draw.circle(screen, RED, (int(self.x), int(self.y)), self.radius - 2)
@@ -0,0 +1,86 @@
+from constants import *
+
+try:
+    import numpy as np
+except ImportError:  # Without numpy homing bullets fall back to Bullet.update's own scan
+    np = None
+
+# Bullets per distance block, keeps the bullets x enemies matrix small
+HOMING_CHUNK = 256
+
+
+def find_homing_targets(bullet_x, bullet_y, enemy_x, enemy_y, max_range=HOMING_RANGE):
+    """Index of the closest enemy within range for every bullet, -1 when none"""
+    targets = np.full(len(bullet_x), -1, dtype=np.intp)
+    if len(enemy_x) == 0:
+        return targets
+    range_sq = max_range * max_range
+    for start in range(0, len(bullet_x), HOMING_CHUNK):
+        stop = start + HOMING_CHUNK
+        dx = enemy_x[np.newaxis, :] - bullet_x[start:stop, np.newaxis]
+        dy = enemy_y[np.newaxis, :] - bullet_y[start:stop, np.newaxis]
+        dist_sq = dx * dx + dy * dy
+        # argmin keeps the first enemy on ties, like the old sequential scan
+        closest = np.argmin(dist_sq, axis=1)
+        in_range = dist_sq[np.arange(len(closest)), closest] < range_sq
+        targets[start:stop] = np.where(in_range, closest, -1)
+    return targets
+
+
+def steer_homing(bullet_x, bullet_y, vel_x, vel_y, targets, enemy_x, enemy_y, turn_rate=HOMING_TURN_RATE):
+    """Turn every bullet with a target toward it, returning the new velocities"""
+    vel_x = vel_x.copy()
+    vel_y = vel_y.copy()
+    has_target = targets >= 0
+    if not has_target.any():
+        return vel_x, vel_y
+    picked = targets[has_target]
+    target_dx = enemy_x[picked] - bullet_x[has_target]
+    target_dy = enemy_y[picked] - bullet_y[has_target]
+    target_dist = np.hypot(target_dx, target_dy)
+    steer = target_dist > 0
+    target_dist = np.where(steer, target_dist, 1)
+    old_x = vel_x[has_target]
+    old_y = vel_y[has_target]
+    speed = np.hypot(old_x, old_y)
+    new_x = old_x + (target_dx / target_dist * speed - old_x) * turn_rate
+    new_y = old_y + (target_dy / target_dist * speed - old_y) * turn_rate
+    vel_x[has_target] = np.where(steer, new_x, old_x)
+    vel_y[has_target] = np.where(steer, new_y, old_y)
+    return vel_x, vel_y
+
+
+def positions(entities):
+    """Gather x/y arrays from a list of entity objects"""
+    count = len(entities)
+    xs = np.fromiter((entity.x for entity in entities), dtype=float, count=count)
+    ys = np.fromiter((entity.y for entity in entities), dtype=float, count=count)
+    return xs, ys
+
+
+def steer_bullet_list(bullets, enemies):
+    """Steer homing bullets held as plain objects in one batched pass"""
+    bullet_x, bullet_y = positions(bullets)
+    enemy_x, enemy_y = positions(enemies)
+    vel_x = np.fromiter((bullet.vel_x for bullet in bullets), dtype=float, count=len(bullets))
+    vel_y = np.fromiter((bullet.vel_y for bullet in bullets), dtype=float, count=len(bullets))
+    targets = find_homing_targets(bullet_x, bullet_y, enemy_x, enemy_y)
+    vel_x, vel_y = steer_homing(bullet_x, bullet_y, vel_x, vel_y, targets, enemy_x, enemy_y)
+    for bullet, new_x, new_y in zip(bullets, vel_x.tolist(), vel_y.tolist()):
+        bullet.vel_x = new_x
+        bullet.vel_y = new_y
+    return targets
+
+
+def steer_bullet_store(bullets, enemies, homing):
+    """Steer the homing rows of an array-backed bullet store in place"""
+    live = np.flatnonzero(enemies.live_mask())
+    enemy_x = enemies.x[live]
+    enemy_y = enemies.y[live]
+    slots = np.flatnonzero(homing)
+    targets = find_homing_targets(bullets.x[slots], bullets.y[slots], enemy_x, enemy_y)
+    vel_x, vel_y = steer_homing(bullets.x[slots], bullets.y[slots], bullets.vel_x[slots], bullets.vel_y[slots],
+                                targets, enemy_x, enemy_y)
+    bullets.vel_x[slots] = vel_x
+    bullets.vel_y[slots] = vel_y
+    return np.where(targets >= 0, live[targets], -1)
@@ -0,0 +1,65 @@
+import heapq
+
+
+def emission_times(last_time, interval, start, end):
+    """Clock times of every emission due in the tick from start to end
+    
+    A fixed-rate source that last emitted at last_time emits again every
+    interval, so one faster than the tick rate emits several times in a tick,
+    each at its own time. A source that fell behind, by being paused or not
+    firing, picks up at start rather than emitting the backlog.
+    """
+    times = []
+    time = max(last_time + interval, start)
+    while time <= end:
+        times.append(time)
+        time += interval
+    return times
+
+
+def rewind(entity, seconds):
+    """Move a new entity back along its velocity by seconds
+    
+    Entities spawned during a tick still move the whole tick with the rest of
+    their population, so one emitted part way in starts that far back and ends
+    the tick where it would be.
+    """
+    entity.x -= entity.vel_x * seconds
+    entity.y -= entity.vel_y * seconds
+
+
+class KineticQueue:
+    """Entities keyed by the time of their next event, in a heap with lazy invalidation
+
+    Each scheduled entity carries the sequence number of its live entry in
+    event_id. Rescheduling or cancelling only changes event_id, and the old
+    entry is dropped when it reaches the top, so every operation is O(log n).
+    """
+    def __init__(self):
+        self.heap = []  # (time, sequence, entity); the sequence keeps entities from being compared
+        self.sequence = 0
+
+    def __len__(self):
+        return len(self.heap)
+
+    def schedule(self, entity, time):
+        self.sequence += 1
+        entity.event_id = self.sequence
+        heapq.heappush(self.heap, (time, self.sequence, entity))
+
+    def cancel(self, entity):
+        entity.event_id = None
+
+    def pop_due(self, now):
+        """Entities whose event time is at or before now, earliest first"""
+        heap = self.heap
+        due = []
+        while heap and heap[0][0] <= now:
+            _, sequence, entity = heapq.heappop(heap)
+            if entity.event_id == sequence:
+                entity.event_id = None
+                due.append(entity)
+        return due
+
+    def clear(self):
+        self.heap = []
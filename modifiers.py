@@ -0,0 +1,87 @@
+from collections import namedtuple
+
+# Stat changes applied once, when a module is installed: module id -> [(player attribute, factor)]
+MODULE_DOWNSIDES = {
+    'explosive_rounds': [('fire_rate', 0.8)],
+    'fire_ring': [('bullet_speed', 0.85)],
+    'regeneration': [('max_hp', 0.9)],
+    'homing_missiles': [('bullet_speed', 0.8)],
+    'damage_aura': [('damage_taken_multiplier', 1.3)],
+    'time_slow': [('fire_rate', 0.7)],
+    'sniper_mode': [('fire_rate', 0.5)],
+    'vampiric': [('max_hp', 0.8)],
+    'ricochet': [('bullet_speed', 0.6)],
+    'armor_plating': [('damage_taken_multiplier', 0.7), ('bullet_speed', 0.7)],
+    'laser_sight': [('fire_rate', 0.85)],
+    'shield_generator': [('fire_rate', 0.85)],
+    'phase_shift': [('fire_rate', 0.8)],
+    'rapid_fire': [('damage', 0.75)],
+    'chain_lightning': [('damage', 0.8)],
+}
+
+# Multipliers folded into the compiled block: module id -> factor
+HIT_DAMAGE_FACTORS = {'damage_aura': 1.4, 'sniper_mode': 2.0, 'overcharge': 1.15}
+BOSS_DAMAGE_FACTORS = {'damage_aura': 1.25}
+SHOT_DAMAGE_FACTORS = {'piercing_rounds': 0.75, 'multi_shot': 0.7}
+EXP_REWARD_FACTORS = {'exp_magnet': 1.5}
+SPAWN_INTERVAL_FACTORS = {'exp_magnet': 0.85}
+
+# Berserker is the only modifier that depends on current HP, so it is checked per hit
+BERSERKER_HP_RATIO = 0.5
+BERSERKER_DAMAGE = 1.75
+
+RICOCHET_BOUNCES = 2
+
+# Enemies closer than this to the turret move at a fraction of their speed
+TIME_SLOW_RADIUS = 200
+TIME_SLOW_FACTOR = 0.6
+
+Modifiers = namedtuple('Modifiers', [
+    'hit_damage',  # Bullet damage multiplier against enemies
+    'boss_damage',  # Bullet damage multiplier against the boss
+    'shot_damage',  # Multiplier on player damage when a bullet is fired
+    'exp_reward',  # Multiplier on EXP and score per kill
+    'spawn_interval',  # Multiplier on the time between enemy spawns
+    'explosive', 'piercing', 'homing', 'multi_shot',  # Bullet flags
+    'berserker', 'time_slow',
+    'ricochet',  # Wall bounces per bullet
+    'shield', 'fire_ring', 'damage_aura', 'phase_shift',  # Effects the HUD draws
+])
+
+
+def product(factors, modules):
+    result = 1.0
+    for module_id in modules:
+        result *= factors.get(module_id, 1.0)
+    return result
+
+
+def compile_modifiers(modules):
+    """Fold the active modules into one immutable block of modifiers"""
+    active = set(modules)
+    return Modifiers(
+        hit_damage=product(HIT_DAMAGE_FACTORS, active),
+        boss_damage=product(BOSS_DAMAGE_FACTORS, active),
+        shot_damage=product(SHOT_DAMAGE_FACTORS, active),
+        exp_reward=product(EXP_REWARD_FACTORS, active),
+        spawn_interval=product(SPAWN_INTERVAL_FACTORS, active),
+        explosive='explosive_rounds' in active,
+        piercing='piercing_rounds' in active,
+        homing='homing_missiles' in active,
+        multi_shot='multi_shot' in active,
+        berserker='berserker' in active,
+        time_slow='time_slow' in active,
+        ricochet=RICOCHET_BOUNCES if 'ricochet' in active else 0,
+        shield='shield_generator' in active,
+        fire_ring='fire_ring' in active,
+        damage_aura='damage_aura' in active,
+        phase_shift='phase_shift' in active,
+    )
+
+
+def apply_downsides(player, module_id):
+    """Scale the player's stats by a newly installed module's downsides"""
+    for stat, factor in MODULE_DOWNSIDES.get(module_id, ()):
+        value = getattr(player, stat) * factor
+        setattr(player, stat, int(value) if stat == 'max_hp' else value)
+    player.hp = min(player.hp, player.max_hp)
@@ -49,15 +49,196 @@ class Module:
          'upside': '2 sec invuln every 8 sec', 'downside': '-20% fire rate', 'color': PURPLE}
     ]
     
+    HANDLERS = {}  # Module id -> ModuleHandler subclass, filled by @register
+    
+    @staticmethod
+    def get(module_id):
+        """Look up a module by id"""
+        return MODULES_BY_ID.get(module_id)
+    
     @staticmethod
     def get_available_modules(player_modules):
         """Get modules that haven't been selected yet"""
         return [m for m in Module.MODULES if m['id'] not in player_modules]
     
     @staticmethod
-    def get_random_modules(player_modules, count=3):
+    def get_random_modules(player_modules, count=3, rng=random):
         """Get random unique modules that haven't been selected"""
         available = Module.get_available_modules(player_modules)
         if not available:
             return []
-        return random.sample(available, min(count, len(available)))
+        return rng.sample(available, min(count, len(available)))
+
+
+MODULES_BY_ID = {module['id']: module for module in Module.MODULES}
+
+# Events a handler can subscribe to by overriding the method of the same name
+EVENTS = ('on_tick', 'on_shot', 'on_hit', 'on_kill', 'on_damage_taken')
+
+
+class ModuleHandler:
+    """Behaviour of one installed module; override only the events it reacts to"""
+    module_id = None
+    
+    def __init__(self, sim):
+        self.sim = sim
+        
+    def on_install(self):
+        pass
+    
+    def on_tick(self, dt, current_time):
+        pass
+    
+    def on_shot(self, bullets):
+        pass
+    
+    def on_hit(self, enemy, bullet, damage):
+        pass
+    
+    def on_kill(self, enemy, damage):
+        pass
+    
+    def on_damage_taken(self, damage):
+        """Return the damage left after this module"""
+        return damage
+
+
+class ModuleHooks:
+    """Handlers of the installed modules, grouped per event so only active ones run"""
+    def __init__(self, sim):
+        self.sim = sim
+        self.handlers = {}  # Module id -> handler instance
+        for event in EVENTS:
+            setattr(self, event, [])
+            
+    def install(self, module_id):
+        """Create a module's handler and subscribe it to the events it overrides"""
+        handler_class = Module.HANDLERS.get(module_id)
+        if handler_class is None:
+            return None
+        handler = handler_class(self.sim)
+        self.handlers[module_id] = handler
+        for event in EVENTS:
+            if getattr(handler_class, event) is not getattr(ModuleHandler, event):
+                getattr(self, event).append(getattr(handler, event))
+        handler.on_install()
+        return handler
+
+
+def register(handler_class):
+    """Class decorator adding a handler to the registry"""
+    Module.HANDLERS[handler_class.module_id] = handler_class
+    return handler_class
+
+
+@register
+class Regeneration(ModuleHandler):
+    module_id = 'regeneration'
+    
+    def __init__(self, sim):
+        super().__init__(sim)
+        self.last_regen_time = 0
+        
+    def on_tick(self, dt, current_time):
+        if current_time - self.last_regen_time >= 1000:
+            player = self.sim.player
+            player.hp = min(player.hp + 2, player.max_hp)
+            self.last_regen_time = current_time
+
+
+@register
+class FireRing(ModuleHandler):
+    module_id = 'fire_ring'
+    
+    def __init__(self, sim):
+        super().__init__(sim)
+        self.last_fire_ring_time = 0
+        
+    def on_tick(self, dt, current_time):
+        if current_time - self.last_fire_ring_time >= 1000:
+            player = self.sim.player
+            self.sim.area_effects.emit(player.x, player.y, 150, 5)
+            self.last_fire_ring_time = current_time
+
+
+@register
+class ShieldGenerator(ModuleHandler):
+    module_id = 'shield_generator'
+    
+    def __init__(self, sim):
+        super().__init__(sim)
+        self.last_shield_regen_time = 0
+        
+    def on_install(self):
+        self.sim.shield_hp = 50
+        
+    def on_tick(self, dt, current_time):
+        if current_time - self.last_shield_regen_time >= 2000:
+            if self.sim.shield_hp < 50:
+                self.sim.shield_hp = min(self.sim.shield_hp + 5, 50)
+            self.last_shield_regen_time = current_time
+            
+    def on_damage_taken(self, damage):
+        absorbed = min(self.sim.shield_hp, damage)
+        self.sim.shield_hp -= absorbed
+        return damage - absorbed
+
+
+@register
+class Overcharge(ModuleHandler):
+    module_id = 'overcharge'
+    
+    def __init__(self, sim):
+        super().__init__(sim)
+        self.last_overcharge_damage = 0
+        
+    def on_tick(self, dt, current_time):
+        if current_time - self.last_overcharge_damage >= 1000:
+            self.sim.player.hp = max(1, self.sim.player.hp - 1)
+            self.last_overcharge_damage = current_time
+
+
+@register
+class PhaseShift(ModuleHandler):
+    """Sets sim.phase_shift_active for the last 2 seconds of every 8"""
+    module_id = 'phase_shift'
+    
+    def __init__(self, sim):
+        super().__init__(sim)
+        self.last_phase_shift = 0
+        
+    def on_tick(self, dt, current_time):
+        elapsed = (current_time - self.last_phase_shift) / 1000.0
+        if elapsed >= 8:
+            self.last_phase_shift = current_time
+            self.sim.phase_shift_active = False
+        elif elapsed >= 6:
+            self.sim.phase_shift_active = True
+        else:
+            self.sim.phase_shift_active = False
+
+
+@register
+class ExplosiveRounds(ModuleHandler):
+    module_id = 'explosive_rounds'
+    
+    def on_hit(self, enemy, bullet, damage):
+        if bullet.explosive:
+            self.sim.area_effects.emit(bullet.x, bullet.y, 80, damage * 0.5, exclude=enemy, blast=(ORANGE, 20))
+
+
+@register
+class Vampiric(ModuleHandler):
+    module_id = 'vampiric'
+    
+    def on_kill(self, enemy, damage):
+        player = self.sim.player
+        player.hp = min(player.hp + 10, player.max_hp)
+
+
+@register
+class ChainLightning(ModuleHandler):
+    module_id = 'chain_lightning'
+    
+    def on_kill(self, enemy, damage):
+        self.sim.area_effects.emit(enemy.x, enemy.y, 100, damage * 0.5, exclude=enemy, spark=CYAN)
@@ -0,0 +1,108 @@
+import csv
+import json
+import time
+from collections import deque
+
+from constants import *
+
+# Timed stages, in the order a frame runs them
+UPDATE_STAGES = ('bullets', 'particles', 'modules', 'boss', 'spawning', 'enemies', 'collision', 'compact')
+DRAW_STAGES = ('entities', 'module_indicators', 'stats_panel', 'hud', 'profiler', 'present')
+STAGES = ('events',) + UPDATE_STAGES + DRAW_STAGES
+
+# Populations counted at the end of every frame
+POPULATIONS = ('enemies', 'bullets', 'particles', 'boss_projectiles')
+
+PERCENTILES = (50, 95, 99)
+
+# Frames between flushes of the log file
+LOG_FLUSH_FRAMES = 60
+
+
+def percentile(ordered, p):
+    """Nearest-rank percentile of a sorted sequence"""
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, len(ordered) * p // 100)]
+
+
+class FrameProfiler:
+    """Time spent in each stage of a frame, kept for the last window frames
+
+    start() marks the beginning of a timed region and lap(stage) charges the
+    time since the last mark to a stage, so a run of laps costs one clock read
+    each. Stages that run several times in a frame, like the update stages when
+    the loop catches up, add up. end_frame() closes the frame and, when a log is
+    open, writes it as one CSV row or JSON line.
+    """
+    def __init__(self, window=PROFILER_WINDOW, clock=time.perf_counter):
+        self.clock = clock
+        self.stages = dict.fromkeys(STAGES, 0.0)
+        self.history = {stage: deque(maxlen=window) for stage in STAGES + ('frame',)}  # Milliseconds
+        self.counts = dict.fromkeys(POPULATIONS, 0)
+        self.quality = 0  # Level of detail the frame was drawn at
+        self.frames = 0
+        self.mark = self.frame_start = self.started = clock()
+        self.log = None
+        self.writer = None  # csv.DictWriter for CSV logs, None for JSON lines
+
+    def start(self):
+        self.mark = self.clock()
+
+    def lap(self, stage):
+        now = self.clock()
+        self.stages[stage] += now - self.mark
+        self.mark = now
+
+    def begin_frame(self):
+        self.frame_start = self.mark = self.clock()
+
+    def end_frame(self, counts, quality=0):
+        """Store the frame's stage times, population counts and quality level, then start over"""
+        frame_ms = (self.clock() - self.frame_start) * 1000
+        self.history['frame'].append(frame_ms)
+        for stage, seconds in self.stages.items():
+            self.history[stage].append(seconds * 1000)
+        self.counts = counts
+        self.quality = quality
+        self.frames += 1
+        if self.log:
+            self.write_row(frame_ms)
+        self.stages = dict.fromkeys(STAGES, 0.0)
+
+    def summary(self, stage):
+        """p50, p95 and p99 of a stage over the window, in milliseconds"""
+        ordered = sorted(self.history[stage])
+        return [percentile(ordered, p) for p in PERCENTILES]
+
+    def open_log(self, path):
+        """Stream every following frame to path: CSV unless it ends in .jsonl"""
+        self.close_log()
+        self.log = open(path, 'w', newline='')
+        if path.endswith('.jsonl'):
+            self.writer = None
+        else:
+            self.writer = csv.DictWriter(self.log, self.log_fields())
+            self.writer.writeheader()
+
+    def close_log(self):
+        if self.log:
+            self.log.close()
+            self.log = None
+            self.writer = None
+
+    def log_fields(self):
+        return ['frame', 'time', 'frame_ms'] + [f'{stage}_ms' for stage in STAGES] + list(POPULATIONS) + ['quality']
+
+    def write_row(self, frame_ms):
+        row = {'frame': self.frames, 'time': round(self.clock() - self.started, 4), 'frame_ms': round(frame_ms, 3)}
+        for stage, seconds in self.stages.items():
+            row[f'{stage}_ms'] = round(seconds * 1000, 3)
+        row.update(self.counts)
+        row['quality'] = self.quality
+        if self.writer:
+            self.writer.writerow(row)
+        else:
+            self.log.write(json.dumps(row) + '\n')
+        if self.frames % LOG_FLUSH_FRAMES == 0:
+            self.log.flush()
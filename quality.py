@@ -0,0 +1,60 @@
+from collections import deque, namedtuple
+
+from constants import *
+
+# What each level of detail draws; level 0 is everything, every later level gives up one more thing
+#   explosion_scale - fraction of each explosion's particles spawned
+#   hp_bars         - damaged enemies show their HP bar
+#   auras           - module aura rings pulse around the turret
+#   stats_refresh   - frames between stats panel re-renders
+Quality = namedtuple('Quality', ['name', 'explosion_scale', 'hp_bars', 'auras', 'stats_refresh'])
+
+QUALITY_LEVELS = (
+    Quality('full', 1.0, True, True, 1),
+    Quality('fewer particles', 0.4, True, True, 1),
+    Quality('no HP bars', 0.4, False, True, 1),
+    Quality('no auras', 0.2, False, False, 1),
+    Quality('slow stats', 0.2, False, False, 30),
+)
+
+# Frames averaged before each decision; the window restarts after every change
+QUALITY_WINDOW = 30
+
+# Mean busy frame time, as a fraction of the frame budget, that steps quality down or back up
+QUALITY_DEGRADE = 0.9
+QUALITY_RESTORE = 0.5
+
+
+class QualityGovernor:
+    """Steps the level of detail down while frames run over budget and back up when they have headroom
+
+    Fed the busy time of every frame, without the wait for the frame cap, so
+    that a machine keeping up is told apart from one that is not. Restoring
+    needs much more headroom than degrading leaves, so a level that only just
+    fits does not flip back and forth.
+    """
+    def __init__(self, budget_ms=1000 / FPS, window=QUALITY_WINDOW):
+        self.budget_ms = budget_ms
+        self.frames = deque(maxlen=window)
+        self.level = 0
+        self.changes = 0
+
+    @property
+    def settings(self):
+        return QUALITY_LEVELS[self.level]
+
+    def update(self, frame_ms):
+        """Record a frame; returns True when the level changed"""
+        self.frames.append(frame_ms)
+        if len(self.frames) < self.frames.maxlen:
+            return False
+        mean = sum(self.frames) / len(self.frames)
+        if mean > self.budget_ms * QUALITY_DEGRADE and self.level < len(QUALITY_LEVELS) - 1:
+            self.level += 1
+        elif mean < self.budget_ms * QUALITY_RESTORE and self.level > 0:
+            self.level -= 1
+        else:
+            return False
+        self.frames.clear()
+        self.changes += 1
+        return True
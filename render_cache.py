@@ -0,0 +1,86 @@
+import pygame
+from collections import OrderedDict
+
+# Pulsing rings only need a handful of distinct alpha levels
+ALPHA_BUCKETS = 16
+
+# Rendered strings kept around; HUD values churn, labels stay hot
+TEXT_CACHE_SIZE = 256
+
+
+class RenderCache:
+    """Pre-rendered translucent surfaces reused across frames"""
+    def __init__(self, screen_size):
+        self.screen_size = screen_size
+        self.surfaces = {}
+        
+    def overlay(self, color, alpha):
+        """Full-screen dimming layer, built once per color/alpha"""
+        key = ('overlay', color, alpha)
+        surface = self.surfaces.get(key)
+        if surface is None:
+            surface = pygame.Surface(self.screen_size)
+            surface.set_alpha(alpha)
+            surface.fill(color)
+            self.surfaces[key] = surface
+        return surface
+    
+    def panel(self, size, rgba):
+        """Translucent rectangle of a given size"""
+        key = ('panel', size, rgba)
+        surface = self.surfaces.get(key)
+        if surface is None:
+            surface = pygame.Surface(size, pygame.SRCALPHA)
+            surface.fill(rgba)
+            self.surfaces[key] = surface
+        return surface
+    
+    def ring(self, color, alpha, radius, width):
+        """Ring sprite sized to its bounding box, alpha rounded to a bucket"""
+        step = 256 // ALPHA_BUCKETS
+        alpha = max(0, min(255, round(alpha / step) * step))
+        key = ('ring', color, alpha, radius, width)
+        surface = self.surfaces.get(key)
+        if surface is None:
+            size = radius * 2 + 2
+            surface = pygame.Surface((size, size), pygame.SRCALPHA)
+            pygame.draw.circle(surface, (*color, alpha), (radius + 1, radius + 1), radius, width)
+            self.surfaces[key] = surface
+        return surface
+    
+    def blit_ring(self, screen, color, alpha, center, radius, width):
+        """Draw a translucent ring, touching only its bounding box, and return that box"""
+        surface = self.ring(color, alpha, radius, width)
+        return screen.blit(surface, (int(center[0]) - radius - 1, int(center[1]) - radius - 1))
+
+
+class TextCache:
+    """LRU cache of rendered text surfaces keyed by font, string and color"""
+    def __init__(self, max_entries=TEXT_CACHE_SIZE):
+        self.max_entries = max_entries
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        
+    def render(self, font, text, color):
+        """Rendered (antialiased) text, from the cache when possible"""
+        key = (font, text, color)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+        self.misses += 1
+        surface = font.render(text, True, color)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.max_entries:
+            self.surfaces.popitem(last=False)
+        return surface
+
+
+# Shared by the HUD and entity draw code
+text_cache = TextCache()
+
+
+def render_text(font, text, color):
+    return text_cache.render(font, text, color)
@@ -0,0 +1,201 @@
+import hashlib
+import struct
+import time
+
+from constants import *
+from world import HAS_NUMPY
+
+# File header: magic, format version, seed, seconds per tick, clock at the first tick,
+# arena width and height, whether the populations and the boss projectiles were array-backed
+HEADER = struct.Struct('<4sBqddHH??')
+MAGIC = b'TDRP'
+VERSION = 4
+
+# Every tick is one flags byte, followed by the fields its flags announce
+FLAG_FIRING = 1  # Trigger held
+FLAG_AIM = 2  # New aim point follows as two doubles, otherwise the last one holds
+FLAG_PICK = 4  # Menu pick follows as a signed byte
+END_OF_LOG = 0xFF  # Last record, followed by the state digest
+AIM = struct.Struct('<dd')
+PICK = struct.Struct('<b')
+DIGEST_SIZE = 20
+
+# Ticks between flushes, so a crash loses at most this much of the log
+FLUSH_TICKS = SIM_TICK_RATE
+
+
+def state_digest(sim):
+    """SHA-1 of everything that decides how the game goes on; equal digests mean equal states
+    
+    Particles are left out: they are cosmetic, draw from their own stream, and
+    how many an explosion spawns depends on the display's quality level.
+    """
+    player = sim.player
+    state = [
+        sim.clock(), sim.score, sim.level, sim.exp, sim.exp_to_next_level, sim.spawn_interval,
+        sim.paused, sim.game_over, sim.game_won, sim.shield_hp, sim.boss_pattern_counter,
+        player.hp, player.max_hp, player.angle, player.damage, player.fire_rate, player.bullet_speed,
+        player.damage_taken_multiplier, player.last_shot_time, tuple(player.modules),
+        [(upgrade['name'], upgrade['rarity']) for upgrade in sim.upgrade_choices],
+        [module['id'] for module in sim.module_choices],
+    ]
+    if sim.boss:
+        boss = sim.boss
+        state += [boss.x, boss.y, boss.hp, boss.phase, boss.current_pattern, boss.pattern_cooldown]
+    for population in (sim.enemies, sim.bullets, sim.boss_projectiles):
+        state.append([(float(entity.x), float(entity.y), float(entity.vel_x), float(entity.vel_y))
+                      for entity in population])
+    state.append([float(enemy.hp) for enemy in sim.enemies])
+    return hashlib.sha1(repr(state).encode()).digest()
+
+
+class InputRecorder:
+    """Input source wrapper that logs what the wrapped source answered, one record per tick"""
+    def __init__(self, source, stream, sim, dt):
+        self.source = source
+        self.stream = stream
+        self.sim = sim
+        self.aim = None
+        self.aim_changed = False
+        self.firing = False
+        self.pick_index = None
+        self.ticks = 0
+        stream.write(HEADER.pack(MAGIC, VERSION, sim.rng.seed, dt, sim.clock(),
+                                 sim.width, sim.height, sim.entity_store, sim.projectile_store))
+
+    def get_aim(self):
+        aim = self.source.get_aim()
+        if aim != self.aim:
+            self.aim = aim
+            self.aim_changed = True
+        return aim
+
+    def is_firing(self):
+        self.firing = self.source.is_firing()
+        return self.firing
+
+    def pick(self, choices):
+        self.pick_index = self.source.pick(choices)
+        return self.pick_index
+
+    def end_tick(self):
+        """Write the record of the tick that just ran"""
+        flags = FLAG_FIRING if self.firing else 0
+        record = b''
+        if self.aim_changed:
+            flags |= FLAG_AIM
+            record += AIM.pack(*self.aim)
+            self.aim_changed = False
+        if self.pick_index is not None:
+            flags |= FLAG_PICK
+            record += PICK.pack(self.pick_index)
+            self.pick_index = None
+        self.stream.write(bytes((flags,)) + record)
+        self.ticks += 1
+        if self.ticks % FLUSH_TICKS == 0:
+            self.stream.flush()
+
+    def close(self):
+        """End the log with a digest of the state after the last tick"""
+        self.stream.write(bytes((END_OF_LOG,)) + state_digest(self.sim))
+        self.stream.flush()
+
+
+class ReplayInput:
+    """Input source answering from a recorded log; call next_tick() before each step"""
+    def __init__(self, stream):
+        self.stream = stream
+        header = stream.read(HEADER.size)
+        if len(header) < HEADER.size:
+            raise ValueError("not an input log: file is too short")
+        (magic, version, self.seed, self.dt, self.start_time, width, height,
+         self.entity_store, self.projectile_store) = HEADER.unpack(header)
+        if magic != MAGIC:
+            raise ValueError("not an input log")
+        if version != VERSION:
+            raise ValueError(f"input log version {version} is not supported")
+        self.screen_size = (width, height)
+        self.aim = (0.0, 0.0)
+        self.firing = False
+        self.pick_index = None
+        self.digest = None  # Recorded end state, None if the log was cut short
+
+    def read(self, size):
+        data = self.stream.read(size)
+        return data if len(data) == size else None
+
+    def next_tick(self):
+        """Load the next tick's input; False once the log is over"""
+        flags = self.read(1)
+        if flags is None:
+            return False
+        flags = flags[0]
+        if flags == END_OF_LOG:
+            self.digest = self.read(DIGEST_SIZE)
+            return False
+        if flags & FLAG_AIM:
+            aim = self.read(AIM.size)
+            if aim is None:
+                return False
+            self.aim = AIM.unpack(aim)
+        self.pick_index = None
+        if flags & FLAG_PICK:
+            pick = self.read(PICK.size)
+            if pick is None:
+                return False
+            self.pick_index = PICK.unpack(pick)[0]
+        self.firing = bool(flags & FLAG_FIRING)
+        return True
+
+    def get_aim(self):
+        return self.aim
+
+    def is_firing(self):
+        return self.firing
+
+    def pick(self, choices):
+        return self.pick_index
+
+
+def replay(stream):
+    """Fast-forward a recorded log without rendering; returns (simulation, ticks, replay input)"""
+    from simulation import ManualClock, Simulation
+
+    source = ReplayInput(stream)
+    if source.entity_store != (USE_ENTITY_STORE and HAS_NUMPY):
+        raise ValueError("the log was recorded with the other population layout; "
+                         "match USE_ENTITY_STORE to replay it")
+    if source.projectile_store != ((USE_ENTITY_STORE or USE_PROJECTILE_STORE) and HAS_NUMPY):
+        raise ValueError("the log was recorded with the other boss projectile layout; "
+                         "match USE_PROJECTILE_STORE and numpy to replay it")
+    sim = Simulation(ManualClock(source.start_time), source, source.screen_size, source.seed)
+    ticks = 0
+    while source.next_tick():
+        sim.step(source.dt)
+        ticks += 1
+    return sim, ticks, source
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(description="Replay a recorded input log without a display")
+    parser.add_argument('log', help="file written by main.py --record or simulation.py --record")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    with open(args.log, 'rb') as stream:
+        sim, ticks, source = replay(stream)
+    elapsed = time.perf_counter() - start
+    print(f"Replayed {ticks} ticks (seed {source.seed}) in {elapsed:.2f}s "
+          f"({ticks / max(elapsed, 1e-9):.0f} ticks/sec)")
+    print(f"Level {sim.level}, score {sim.score}, HP {sim.player.hp:.0f}/{sim.player.max_hp:.0f}, "
+          f"modules {sim.player.modules}, {'won' if sim.game_won else 'lost' if sim.game_over else 'alive'}")
+    if source.digest is None:
+        print("Log ends without a digest (the session was cut short); end state not verified")
+    elif source.digest == state_digest(sim):
+        print("End state matches the recording")
+    else:
+        print("End state differs from the recording")
+        sys.exit(1)
@@ -0,0 +1,27 @@
+import random
+from contextlib import contextmanager
+
+# Each subsystem draws from its own stream, so extra draws in one never shift another
+STREAMS = ('spawn', 'particles', 'boss', 'modules', 'upgrades')
+
+
+class RandomStreams:
+    """One seeded random.Random per subsystem, all derived from a single game seed"""
+    def __init__(self, seed=None):
+        if seed is None:
+            seed = random.SystemRandom().randrange(2 ** 32)
+        self.seed = seed
+        for name in STREAMS:
+            setattr(self, name, random.Random(f'{seed}:{name}'))
+
+    @contextmanager
+    def global_state(self, name):
+        """Run code that uses the global random module on one stream's state"""
+        stream = getattr(self, name)
+        saved = random.getstate()
+        random.setstate(stream.getstate())
+        try:
+            yield
+        finally:
+            stream.setstate(random.getstate())
+            random.setstate(saved)
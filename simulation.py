@@ -0,0 +1,684 @@
+import math
+import time
+
+from constants import *
+from entities import Player, Bullet, Enemy, Boss, BossProjectile, Particle
+from modules import Module, ModuleHooks
+from upgrades import Upgrade
+from dialogue import BossDialogue
+from spatial import SpatialGrid
+from aoe import AreaEffects
+from barrage import PATTERNS, projectile_hits, swept_targets, volley_angle, volley_columns
+from kinetic import KineticQueue, emission_times, rewind
+from modifiers import TIME_SLOW_FACTOR, TIME_SLOW_RADIUS
+from rng import RandomStreams
+from profiler import FrameProfiler
+from world import FLAG_HOMING, HAS_NUMPY, create_population, np
+from homing import steer_bullet_list, steer_bullet_store
+
+
+class ManualClock:
+    """Millisecond clock that only moves when advanced, for headless runs"""
+    def __init__(self, start=0):
+        self.ticks = start
+        
+    def __call__(self):
+        return self.ticks
+    
+    def advance(self, ms):
+        self.ticks += ms
+
+
+class ScriptedInput:
+    """Input source for headless runs: fixed aim, trigger held, first menu option"""
+    def __init__(self, aim=(0, 0), firing=True, pick_index=0):
+        self.aim = aim
+        self.firing = firing
+        self.pick_index = pick_index
+        
+    def get_aim(self):
+        return self.aim
+    
+    def is_firing(self):
+        return self.firing
+    
+    def pick(self, choices):
+        """Index of the menu option to take, -1 to skip modules, None to keep waiting"""
+        if not choices:
+            return -1
+        return min(self.pick_index, len(choices) - 1)
+
+
+class AutoAimInput(ScriptedInput):
+    """Headless input that keeps the trigger held and aims at the closest threat"""
+    def __init__(self, pick_index=0):
+        super().__init__(firing=True, pick_index=pick_index)
+        self.sim = None
+        
+    def get_aim(self):
+        sim = self.sim
+        if sim.boss:
+            return sim.boss.x, sim.boss.y
+        player = sim.player
+        closest = min(sim.enemies, default=None,
+                      key=lambda enemy: (enemy.x - player.x) ** 2 + (enemy.y - player.y) ** 2)
+        if closest:
+            return closest.x, closest.y
+        return self.aim
+
+
+class Simulation:
+    """Game rules and state, with no display, wall clock or mouse dependency
+    
+    The clock is a callable returning milliseconds, the input source provides
+    get_aim(), is_firing() and pick(choices), and the arena size is fixed at
+    construction. All randomness comes from streams seeded by seed, a fresh
+    one when None. Game subclasses this to add rendering, sound and events.
+    """
+    def __init__(self, clock=None, input_source=None, screen_size=(SCREEN_WIDTH, SCREEN_HEIGHT), seed=None):
+        self.clock = clock or ManualClock()
+        self.input = input_source or ScriptedInput()
+        self.width, self.height = screen_size
+        self.seed = seed
+        self.profiler = FrameProfiler()
+        self.recorder = None  # InputRecorder wrapping self.input while recording
+        self.explosion_scale = 1.0  # Fraction of explosion particles spawned, lowered by Game under load
+        self.patterns = PATTERNS  # Boss attack patterns by name
+        self.reset_game()
+    
+    def emit_sound(self, name):
+        """Hook for sound effects; the headless simulation stays silent"""
+        pass
+    
+    def step(self, dt):
+        """Advance the clock by one tick of dt seconds and update"""
+        # Start-of-tick positions feed both render interpolation and swept bullet collision
+        self.save_previous_positions()
+        self.clock.advance(dt * 1000)
+        self.update(dt)
+        if self.recorder:
+            self.recorder.end_tick()
+    
+    def record_input(self, stream, dt):
+        """Log the input of every following tick to a binary stream, for replay.py
+        
+        Call right after reset_game(), so the replay starts from the same state.
+        """
+        from replay import InputRecorder
+        self.stop_recording()
+        self.recorder = InputRecorder(self.input, stream, self, dt)
+        self.input = self.recorder
+    
+    def stop_recording(self):
+        """Close the log with a digest of the current state and unwrap the input"""
+        if self.recorder:
+            self.recorder.close()
+            self.input = self.recorder.source
+            self.recorder = None
+    
+    def save_previous_positions(self):
+        """Remember where everything was before the next tick"""
+        self.bullets.save_previous_positions()
+        self.enemies.save_previous_positions()
+        self.particles.save_previous_positions()
+        self.boss_projectiles.save_previous_positions()
+        if self.boss:
+            self.boss.prev_x = self.boss.x
+            self.boss.prev_y = self.boss.y
+    
+    def reset_game(self):
+        """Reset game state for new game"""
+        self.rng = RandomStreams(self.seed)
+        self.player = Player(self.width / 2, self.height / 2)
+        # Array-backed populations are optional and need numpy
+        self.entity_store = USE_ENTITY_STORE and HAS_NUMPY
+        self.bullets = create_population(Bullet, self.entity_store, BULLET_POOL_SIZE)
+        self.enemies = create_population(Enemy, self.entity_store)
+        self.particles = create_population(Particle, self.entity_store, PARTICLE_POOL_SIZE)
+        self.boss = None
+        # Boss projectiles are the densest population, so they are array-backed whenever numpy is there
+        self.projectile_store = (USE_ENTITY_STORE or USE_PROJECTILE_STORE) and HAS_NUMPY
+        self.boss_projectiles = create_population(BossProjectile, self.projectile_store)
+        self.bullet_grid = SpatialGrid(COLLISION_CELL_SIZE)
+        self.bounced_bullets = []  # Bullets whose path turned at a wall this tick
+        # Enemies fly straight at a turret that never moves, so contacts and
+        # despawns are known ahead and kept in queues keyed by active_time
+        self.active_time = 0.0  # Seconds of unpaused play before the current tick
+        self.contacts = KineticQueue()
+        self.despawns = KineticQueue()
+        self.boss_pattern_counter = 0
+        self.score = 0
+        self.level = 1
+        self.exp = 0
+        self.exp_to_next_level = 100
+        self.game_over = False
+        self.game_won = False
+        self.paused = False
+        self.upgrade_choices = []
+        self.module_choices = []
+        self.boss_dialogue = None
+        self.boss_dialogue_time = 0
+        self.start_time = self.clock()
+        self.last_spawn_time = 0
+        self.spawn_interval = 2000
+        self.game_time = 0
+        self.difficulty_scale = 1.0
+        self.shield_hp = 0
+        self.phase_shift_active = False
+        self.hooks = ModuleHooks(self)
+        self.area_effects = AreaEffects(self)
+        self.show_stats = True  # Always show stats panel, can minimize with TAB
+        self.stats_minimized = False  # Stats panel minimized state
+        
+    def get_spawn_position(self):
+        """Get random position on screen edge"""
+        rng = self.rng.spawn
+        edge = rng.randint(0, 3)
+        if edge == 0:  # Top
+            return rng.randint(0, self.width), -30
+        elif edge == 1:  # Right
+            return self.width + 30, rng.randint(0, self.height)
+        elif edge == 2:  # Bottom
+            return rng.randint(0, self.width), self.height + 30
+        else:  # Left
+            return -30, rng.randint(0, self.height)
+            
+    def spawn_enemy(self, delay=0.0):
+        """Spawn a random enemy, delay seconds into the tick"""
+        x, y = self.get_spawn_position()
+        enemy_type = self.rng.spawn.choice(list(ENEMY_TYPES.keys()))
+        self.add_enemy(x, y, enemy_type, delay)
+    
+    def add_enemy(self, x, y, enemy_type, delay=0.0):
+        """Spawn an enemy heading for the turret and schedule when it will reach it"""
+        enemy = self.enemies.spawn(x, y, enemy_type, self.difficulty_scale)
+        enemy.aim_at(self.player.x, self.player.y)
+        rewind(enemy, delay)
+        self.contacts.schedule(enemy, self.active_time + self.contact_delay(enemy))
+        return enemy
+    
+    def contact_delay(self, enemy):
+        """Seconds until an enemy flying straight from where it is touches the turret"""
+        player = self.player
+        distance = math.hypot(enemy.x - player.x, enemy.y - player.y) - enemy.spec.radius - player.radius
+        if distance <= 0:
+            return 0.0
+        if not player.modifiers.time_slow:
+            return distance / enemy.speed
+        # Full speed up to the edge of the time slow field, slowed from there on
+        outside = max(0.0, distance - max(0.0, TIME_SLOW_RADIUS - enemy.spec.radius - player.radius))
+        return (outside + (distance - outside) / TIME_SLOW_FACTOR) / enemy.speed
+    
+    def reschedule_contacts(self):
+        """Re-key every enemy's contact after their speed near the turret changed"""
+        for enemy in self.enemies:
+            self.contacts.schedule(enemy, self.active_time + self.contact_delay(enemy))
+        
+    def update_difficulty(self):
+        """Increase difficulty over time"""
+        time_seconds = self.game_time / 1000
+        self.difficulty_scale = 1.0 + (time_seconds / 30) * 0.1
+        self.spawn_interval = max(300, 1500 - (time_seconds * 10)) * self.player.modifiers.spawn_interval
+        
+    def add_exp(self, amount):
+        """Add experience and check for level up"""
+        self.exp += int(amount * self.player.exp_multiplier)
+        if self.exp >= self.exp_to_next_level:
+            self.level_up()
+    
+    def level_up(self):
+        """Level up and show upgrade/module choices"""
+        self.level += 1
+        self.exp -= self.exp_to_next_level
+        self.exp_to_next_level = int(self.exp_to_next_level * 1.2)
+        
+        # Boss dialogue every 5 levels
+        if self.level % 5 == 0 and self.level < 30:
+            dialogue_index = (self.level // 5) - 1
+            if dialogue_index < len(BossDialogue.DIALOGUES):
+                self.boss_dialogue = BossDialogue.DIALOGUES[dialogue_index]
+                self.boss_dialogue_time = self.clock()
+        
+        # Boss fight at level 30
+        if self.level == 30:
+            self.start_boss_fight()
+            return
+        
+        self.paused = True
+        
+        # Every 3 levels, offer modules instead of upgrades
+        if self.level % 3 == 0:
+            self.module_choices = Module.get_random_modules(self.player.modules, 3, self.rng.modules)
+            self.upgrade_choices = []
+        else:
+            with self.rng.global_state('upgrades'):
+                self.upgrade_choices = Upgrade.get_random_upgrades(3)
+            self.module_choices = []
+        
+        self.emit_sound('levelup')
+        
+    def choose_upgrade(self, index):
+        """Apply one of the offered upgrades and resume"""
+        Upgrade.apply_upgrade(self.player, self.upgrade_choices[index])
+        self.player.recompile_modifiers()
+        self.paused = False
+        self.upgrade_choices = []
+    
+    def choose_module(self, index):
+        """Install one of the offered modules and resume"""
+        module = self.module_choices[index]
+        time_slow = self.player.modifiers.time_slow
+        self.player.add_module(module['id'])
+        self.hooks.install(module['id'])
+        if self.player.modifiers.time_slow != time_slow:
+            self.reschedule_contacts()
+        self.paused = False
+        self.module_choices = []
+    
+    def skip_modules(self):
+        """Decline the offered modules and resume"""
+        self.paused = False
+        self.module_choices = []
+    
+    def apply_menu_pick(self):
+        """Let the input source answer an open upgrade/module menu"""
+        if self.upgrade_choices:
+            index = self.input.pick(self.upgrade_choices)
+            if index is not None:
+                self.choose_upgrade(index)
+        elif self.module_choices:
+            index = self.input.pick(self.module_choices)
+            if index is None:
+                return
+            if index < 0:
+                self.skip_modules()
+            else:
+                self.choose_module(index)
+    
+    def update_boss_fight(self, dt, current_time):
+        """Update boss fight logic"""
+        self.boss.update(dt, self.player, current_time)
+        
+        taunt = self.boss.get_taunt(current_time)
+        if taunt:
+            self.boss_dialogue = taunt
+            self.boss_dialogue_time = current_time
+        
+        tick_start = current_time - dt * 1000
+        for emit_time in self.boss.projectile_times(dt, current_time):
+            pattern = self.boss.get_current_pattern()
+            self.spawn_boss_projectiles(pattern, emit_time, (emit_time - tick_start) / 1000)
+        
+        # Update boss projectiles
+        if self.boss_projectiles.vectorized:
+            projectiles = self.boss_projectiles
+            projectiles.step(dt)
+            projectiles.cull_off_screen(self.width, self.height)
+            touching = projectiles.within(self.player.x, self.player.y,
+                                          projectiles.radius[:projectiles.count] + self.player.radius)
+            for proj in [projectiles[slot] for slot in np.flatnonzero(touching)]:
+                self.handle_projectile_contact(proj, current_time)
+        else:
+            for proj in self.boss_projectiles:
+                proj.update(dt)
+                if proj.is_off_screen(self.width, self.height):
+                    self.boss_projectiles.kill(proj)
+                elif proj.collides_with_player(self.player):
+                    self.handle_projectile_contact(proj, current_time)
+        
+    def resolve_boss_hits(self, current_time):
+        """Collide bullets with boss projectiles and the boss, after bullets have moved"""
+        # Every bullet is tested against every projectile in one batch, bounced paths one by one
+        batched = HAS_NUMPY and len(self.boss_projectiles) > 0
+        hits = projectile_hits(self.bullets, self.boss_projectiles) if batched else {}
+        for bullet in self.bullets:
+            hit_projectile = False
+            if not batched or bullet.bounce_x is not None:
+                candidates = [proj for proj in self.boss_projectiles if proj.collides_with_bullet(bullet)]
+            else:
+                candidates = hits.get(bullet, ())
+            for proj in candidates:
+                if not proj.removed:
+                    destroyed = proj.take_damage(1)
+                    if destroyed:
+                        self.create_explosion(proj.x, proj.y, ORANGE, 8)
+                        if proj in self.boss_projectiles:
+                            self.boss_projectiles.kill(proj)
+                    if bullet in self.bullets:
+                        self.bullets.kill(bullet)
+                    hit_projectile = True
+                    break
+            
+            if not hit_projectile:
+                if bullet.sweeps_circle(self.boss.x, self.boss.y, self.boss.radius):
+                    hit = self.boss.take_damage(bullet.damage * self.player.modifiers.boss_damage)
+                    if hit:
+                        self.emit_sound('hit')
+                    if bullet in self.bullets:
+                        self.bullets.kill(bullet)
+                    
+                    if not self.boss.is_alive():
+                        self.game_won = True
+                        self.boss_dialogue = BossDialogue.BOSS_DEFEAT
+                        self.boss_dialogue_time = current_time
+                        self.emit_sound('kill')
+                        self.create_explosion(self.boss.x, self.boss.y, GOLD, 50)
+                        break
+    
+    def handle_projectile_contact(self, proj, current_time):
+        """Apply damage from a boss projectile hitting the turret and remove it"""
+        damage = 15
+        for hook in self.hooks.on_damage_taken:
+            damage = hook(damage)
+        if damage > 0:
+            self.player.take_damage(damage * self.player.damage_taken_multiplier)
+        if proj in self.boss_projectiles:
+            self.boss_projectiles.kill(proj)
+        if not self.player.is_alive():
+            self.game_over = True
+            self.boss_dialogue = BossDialogue.BOSS_WIN
+            self.boss_dialogue_time = current_time
+    
+    def spawn_boss_projectiles(self, pattern, current_time, delay=0.0):
+        """Emit one volley of an attack pattern, delay seconds into the tick"""
+        pattern = self.patterns[pattern]
+        boss = self.boss
+        angle = volley_angle(pattern, self.boss_pattern_counter, current_time,
+                             (boss.x, boss.y), (self.player.x, self.player.y), self.rng.boss)
+        self.boss_pattern_counter += 1
+        if angle is None:
+            return
+        # The whole volley is laid out and added at once, each projectile moved back by how late in the tick it left
+        self.boss_projectiles.spawn_many(*volley_columns(pattern, angle, (boss.x, boss.y), delay))
+    
+    def award_kill(self, enemy):
+        """Score, EXP and explosion for a dead enemy, then remove it"""
+        exp_reward = int(enemy.exp_reward * self.player.modifiers.exp_reward)
+        self.score += exp_reward
+        self.add_exp(exp_reward)
+        self.create_explosion(enemy.x, enemy.y, enemy.color)
+        self.enemies.kill(enemy)
+    
+    def create_explosion(self, x, y, color, count=15):
+        """Create particle explosion effect"""
+        for _ in range(max(1, int(count * self.explosion_scale))):
+            self.particles.spawn(x, y, color, self.rng.particles)
+    
+    def start_boss_fight(self):
+        """Initialize boss fight at level 30"""
+        self.boss = Boss(self.width / 2, self.height / 4, self.width, self.height, self.rng.boss)
+        self.enemies.clear()
+        self.boss_dialogue = "Finally! I was getting bored waiting for you."
+        self.boss_dialogue_time = self.clock()
+        self.emit_sound('levelup')
+    
+    def update(self, dt):
+        """Update game state"""
+        if self.paused:
+            self.apply_menu_pick()
+        if self.game_over or self.game_won or self.paused:
+            return
+            
+        profiler = self.profiler
+        profiler.start()
+        self.game_time = self.clock() - self.start_time
+        current_time = self.clock()
+        
+        if not self.boss:
+            self.update_difficulty()
+        
+        aim_x, aim_y = self.input.get_aim()
+        self.player.aim(aim_x, aim_y)
+        
+        # Every shot, projectile volley and spawn due this tick happens at its own time in it
+        tick_start = current_time - dt * 1000
+        if self.input.is_firing():
+            for shot_time in self.player.due_shots(tick_start, current_time):
+                self.fire_volley((shot_time - tick_start) / 1000)
+        profiler.lap('bullets')
+        
+        if self.particles.vectorized:
+            if self.particles:
+                self.particles.step(dt)
+                self.particles.age_by(dt)
+                self.particles.cull_expired()
+        else:
+            for particle in self.particles:
+                particle.update(dt)
+                if particle.is_dead():
+                    self.particles.kill(particle)
+        profiler.lap('particles')
+        
+        for hook in self.hooks.on_tick:
+            hook(dt, current_time)
+        profiler.lap('modules')
+        
+        if self.boss:
+            self.update_boss_fight(dt, current_time)
+            profiler.lap('boss')
+        
+        if not self.boss:
+            for spawn_time in emission_times(self.last_spawn_time, self.spawn_interval, tick_start, current_time):
+                self.spawn_enemy((spawn_time - tick_start) / 1000)
+                self.last_spawn_time = spawn_time
+        profiler.lap('spawning')
+        
+        if self.bullets.vectorized:
+            homing = self.bullets.flagged(FLAG_HOMING)
+            if self.enemies and homing.any():
+                steer_bullet_store(self.bullets, self.enemies, homing)
+            self.bullets.step(dt)
+            if self.player.modifiers.ricochet:
+                outside = self.bullets.off_screen_mask(self.width, self.height, 0)
+                for bullet in [self.bullets[slot] for slot in np.flatnonzero(outside)]:
+                    self.bounce_bullet(bullet)
+            self.bullets.cull_off_screen(self.width, self.height)
+        else:
+            # Homing bullets pick targets and steer together, then everything just moves
+            steer_enemies = self.enemies
+            if HAS_NUMPY and self.enemies:
+                homing_bullets = [bullet for bullet in self.bullets if bullet.homing]
+                if homing_bullets:
+                    steer_bullet_list(homing_bullets, self.enemies)
+                steer_enemies = None
+            ricochet = self.player.modifiers.ricochet
+            for bullet in self.bullets:
+                bullet.update(dt, steer_enemies)
+                if ricochet:
+                    self.bounce_bullet(bullet)
+                # Straight-line bullets leave on schedule, only the rest are checked every tick
+                if bullet.event_id is None and bullet.is_off_screen(self.width, self.height):
+                    self.bullets.kill(bullet)
+            for bullet in self.despawns.pop_due(self.active_time + dt):
+                if bullet in self.bullets:
+                    self.bullets.kill(bullet)
+        profiler.lap('bullets')
+        
+        if self.boss:
+            self.resolve_boss_hits(current_time)
+            profiler.lap('boss')
+        
+        if self.enemies.vectorized:
+            self.move_enemies_vectorized(dt)
+        else:
+            self.move_enemies(dt)
+        profiler.lap('enemies')
+        
+        # Broad phase: bucket each bullet over the path it swept, then each enemy only tests nearby ones
+        self.bullet_grid.rebuild_paths(self.bullets)
+        if not self.enemies.vectorized:
+            for enemy in self.enemies:
+                self.resolve_bullet_hits(enemy)
+        elif self.bullets and self.enemies:
+            # Array pass first, so the narrow phase only runs for enemies some bullet came near
+            for slot in swept_targets(self.bullets, self.enemies, self.bounced_bullets):
+                enemy = self.enemies[slot]
+                if not enemy.removed:
+                    self.resolve_bullet_hits(enemy)
+        profiler.lap('collision')
+        
+        # Area damage emitted during the tick lands in one pass
+        self.area_effects.resolve()
+        profiler.lap('modules')
+        
+        for bullet in self.bounced_bullets:
+            bullet.bounce_x = bullet.bounce_y = None
+        self.bounced_bullets = []
+        
+        # Removals during the tick only mark entities, the lists shrink once here
+        self.compact_populations()
+        self.active_time += dt
+        profiler.lap('compact')
+    
+    def fire_volley(self, delay):
+        """Fire one shot, delay seconds into the tick"""
+        bullets = self.player.volley(self.bullets.spawn)
+        for bullet in bullets:
+            rewind(bullet, delay)
+        self.emit_sound('shoot')
+        for hook in self.hooks.on_shot:
+            hook(bullets)
+        if not self.bullets.vectorized:
+            self.schedule_despawns(bullets)
+    
+    def schedule_despawns(self, bullets):
+        """Queue when each new straight-line bullet will be off screen"""
+        if self.player.modifiers.ricochet:
+            return
+        for bullet in bullets:
+            exit_time = None if bullet.homing else bullet.exit_time(self.width, self.height)
+            if exit_time is not None:
+                self.despawns.schedule(bullet, self.active_time + exit_time)
+    
+    def bounce_bullet(self, bullet):
+        """Ricochet a bullet off the arena walls"""
+        if bullet.bounce(self.width, self.height, self.player.modifiers.ricochet):
+            self.bounced_bullets.append(bullet)
+            self.despawns.cancel(bullet)  # Its path changed, so it falls back to the per-tick check
+    
+    def compact_populations(self):
+        """Reclaim every entity removed during this tick"""
+        self.bullets.compact()
+        self.enemies.compact()
+        self.particles.compact()
+        self.boss_projectiles.compact()
+    
+    def move_enemies(self, dt):
+        """Move enemies one object at a time"""
+        time_slow = self.player.modifiers.time_slow
+        for enemy in self.enemies:
+            enemy_dt = dt
+            if time_slow:
+                dx = enemy.x - self.player.x
+                dy = enemy.y - self.player.y
+                if dx * dx + dy * dy < TIME_SLOW_RADIUS * TIME_SLOW_RADIUS:
+                    enemy_dt *= TIME_SLOW_FACTOR
+            enemy.update(enemy_dt)
+        self.resolve_contacts(dt)
+    
+    def move_enemies_vectorized(self, dt):
+        """Move the array-backed enemy population"""
+        enemies = self.enemies
+        speed_scale = None
+        if self.player.modifiers.time_slow:
+            speed_scale = np.where(enemies.within(self.player.x, self.player.y, TIME_SLOW_RADIUS),
+                                   TIME_SLOW_FACTOR, 1.0)
+        enemies.step(dt, speed_scale)
+        self.resolve_contacts(dt)
+    
+    def resolve_contacts(self, dt):
+        """Damage the turret for every enemy scheduled to reach it during this tick"""
+        for enemy in self.contacts.pop_due(self.active_time + dt):
+            if enemy in self.enemies:
+                self.handle_enemy_contact(enemy)
+    
+    def handle_enemy_contact(self, enemy):
+        """Apply contact damage from an enemy reaching the turret and remove it"""
+        if self.phase_shift_active:
+            self.enemies.kill(enemy)
+            return
+        
+        damage = 10 * self.player.damage_taken_multiplier
+        for hook in self.hooks.on_damage_taken:
+            damage = hook(damage)
+        if damage > 0:
+            self.player.take_damage(damage)
+        self.enemies.kill(enemy)
+        if not self.player.is_alive():
+            self.game_over = True
+    
+    def resolve_bullet_hits(self, enemy):
+        """Narrow-phase bullet collision for one enemy"""
+        hooks = self.hooks
+        for bullet in self.bullet_grid.query(enemy.x, enemy.y, enemy.spec.radius):
+            if enemy.collides_with_bullet(bullet):
+                damage = self.player.hit_damage(bullet.damage)
+                enemy.take_damage(damage)
+                self.emit_sound('hit')
+                for hook in hooks.on_hit:
+                    hook(enemy, bullet, damage)
+                
+                if bullet.piercing:
+                    bullet.hits += 1
+                    if bullet.hits >= 3:
+                        if bullet in self.bullets:
+                            self.bullets.kill(bullet)
+                        self.bullet_grid.remove(bullet)
+                else:
+                    if bullet in self.bullets:
+                        self.bullets.kill(bullet)
+                    self.bullet_grid.remove(bullet)
+                
+                if not enemy.is_alive() and enemy in self.enemies:
+                    self.award_kill(enemy)
+                    self.emit_sound('kill')
+                    for hook in hooks.on_kill:
+                        hook(enemy, damage)
+                
+                if not bullet.piercing:
+                    break
+
+
+def run_headless(ticks, dt=1 / FPS, input_source=None, screen_size=(SCREEN_WIDTH, SCREEN_HEIGHT),
+                 seed=None, record=None):
+    """Step a fresh simulation for a number of ticks and return it
+    
+    record is an optional binary stream that receives the input log.
+    """
+    clock = ManualClock()
+    if input_source is None:
+        input_source = AutoAimInput()
+    sim = Simulation(clock, input_source, screen_size, seed)
+    if isinstance(input_source, AutoAimInput):
+        input_source.sim = sim
+    if record is not None:
+        sim.record_input(record, dt)
+    for _ in range(ticks):
+        sim.step(dt)
+        if sim.game_over or sim.game_won:
+            break
+    sim.stop_recording()
+    return sim
+
+
+if __name__ == "__main__":
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Run the game simulation without a display")
+    parser.add_argument('--ticks', type=int, default=36000, help="ticks to simulate (default: 10 minutes at 60 FPS)")
+    parser.add_argument('--dt', type=float, default=1 / FPS, help="seconds per tick")
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--record', metavar='FILE', help="write the input log to FILE for replay.py")
+    args = parser.parse_args()
+    
+    record = open(args.record, 'wb') if args.record else None
+    start = time.perf_counter()
+    sim = run_headless(args.ticks, args.dt, seed=args.seed, record=record)
+    elapsed = time.perf_counter() - start
+    ticks_run = int(round(sim.clock() / (args.dt * 1000)))
+    print(f"Simulated {ticks_run} ticks ({sim.clock() / 1000:.0f}s game time) in {elapsed:.2f}s "
+          f"({ticks_run / elapsed:.0f} ticks/sec)")
+    print(f"Level {sim.level}, score {sim.score}, HP {sim.player.hp:.0f}/{sim.player.max_hp:.0f}, "
+          f"modules {sim.player.modules}, {'won' if sim.game_won else 'lost' if sim.game_over else 'alive'}")
+    if record:
+        record.close()
@@ -0,0 +1,83 @@
+import math
+
+
+class SpatialGrid:
+    """Uniform grid for broad-phase collision queries"""
+    def __init__(self, cell_size=64):
+        self.cell_size = cell_size
+        self.cells = {}
+        self.order = {}  # id(item) -> insertion order of live items, keeps query results stable
+        self.counter = 0
+
+    def clear(self):
+        """Remove every item from the grid"""
+        self.cells.clear()
+        self.order.clear()
+        self.counter = 0
+
+    def cell_range(self, x, y, radius):
+        """Get the cell keys covered by a circle's bounding box"""
+        return self.box_range(x - radius, y - radius, x + radius, y + radius)
+
+    def box_range(self, min_x, min_y, max_x, max_y):
+        """Get the cell keys covered by a box"""
+        size = self.cell_size
+        min_cx = math.floor(min_x / size)
+        max_cx = math.floor(max_x / size)
+        min_cy = math.floor(min_y / size)
+        max_cy = math.floor(max_y / size)
+        return [(cx, cy) for cx in range(min_cx, max_cx + 1) for cy in range(min_cy, max_cy + 1)]
+
+    def insert(self, item, x, y, radius):
+        """Add an item occupying a circle at (x, y)"""
+        self.insert_keys(item, self.cell_range(x, y, radius))
+
+    def insert_box(self, item, min_x, min_y, max_x, max_y):
+        """Add an item occupying a box, such as the path a bullet swept"""
+        self.insert_keys(item, self.box_range(min_x, min_y, max_x, max_y))
+
+    def insert_keys(self, item, keys):
+        for key in keys:
+            bucket = self.cells.get(key)
+            if bucket is None:
+                self.cells[key] = [item]
+            else:
+                bucket.append(item)
+        self.order[id(item)] = self.counter
+        self.counter += 1
+
+    def remove(self, item):
+        """Remove an item so later queries no longer return it
+
+        The item stays in its buckets, where queries skip it, until the next
+        clear(); the grid is rebuilt every tick, so searching the buckets now
+        would cost more than stepping over it.
+        """
+        self.order.pop(id(item), None)
+
+    def rebuild(self, items):
+        """Clear the grid and insert every item at its current position"""
+        self.clear()
+        for item in items:
+            self.insert(item, item.x, item.y, item.radius)
+
+    def rebuild_paths(self, items):
+        """Clear the grid and insert every item over the box its path_bounds() reports"""
+        self.clear()
+        for item in items:
+            self.insert_box(item, *item.path_bounds())
+
+    def query(self, x, y, radius):
+        """Get items whose cells overlap a circle, in insertion order"""
+        found = {}
+        cells = self.cells
+        order = self.order
+        for key in self.cell_range(x, y, radius):
+            bucket = cells.get(key)
+            if bucket:
+                for item in bucket:
+                    if id(item) in order:
+                        found[id(item)] = item
+        if len(found) > 1:
+            return sorted(found.values(), key=lambda item: order[id(item)])
+        return list(found.values())
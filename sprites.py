@@ -0,0 +1,226 @@
+import math
+import pygame
+
+from constants import *
+from entities import Player, interpolate
+from world import FLAG_EXPLOSIVE, FLAG_HOMING, FLAG_PIERCING, np
+
+# The turret barrel is pre-rotated in this many steps around the circle
+TURRET_ANGLE_STEPS = 180
+
+# Enemy HP bars have one sprite per filled pixel
+HP_BAR_WIDTH = 40
+
+# Transparent color of every sprite; shapes are hard-edged, so RLE colorkey blits
+# are several times faster than per-pixel alpha
+SPRITE_KEY = (1, 2, 3)
+
+
+def blank_sprite(width, height):
+    """Empty colorkeyed surface to draw a sprite on"""
+    surface = pygame.Surface((width, height))
+    surface.fill(SPRITE_KEY)
+    surface.set_colorkey(SPRITE_KEY, pygame.RLEACCEL)
+    return surface
+
+
+def circle_sprite(layers):
+    """Concentric circles drawn once; layers are (color, radius, width) from the bottom up"""
+    outer = max(radius for _, radius, _ in layers)
+    center = outer + 1
+    surface = blank_sprite(center * 2, center * 2)
+    for color, radius, width in layers:
+        pygame.draw.circle(surface, color, (center, center), radius, width)
+    return surface, center, center
+
+
+# Flag bits that pick a bullet's sprite in an EntityStore
+BULLET_FLAGS = FLAG_EXPLOSIVE | FLAG_PIERCING | FLAG_HOMING
+
+
+def bullet_variant(bullet):
+    if bullet.explosive:
+        return 'explosive'
+    if bullet.piercing:
+        return 'piercing'
+    if bullet.homing:
+        return 'homing'
+    return 'plain'
+
+
+def flag_variant(flags):
+    """bullet_variant() of a bullet stored with these flag bits"""
+    if flags & FLAG_EXPLOSIVE:
+        return 'explosive'
+    if flags & FLAG_PIERCING:
+        return 'piercing'
+    if flags & FLAG_HOMING:
+        return 'homing'
+    return 'plain'
+
+
+class SpriteAtlas:
+    """Entity sprites rendered once, so the draw pass is a few Surface.blits() calls
+
+    Every sprite is (surface, ox, oy): blitting at (x - ox, y - oy) centers it on (x, y).
+    """
+    def __init__(self, bullet_radius=5, projectile_radius=8):
+        r = bullet_radius
+        self.bullets = {
+            'explosive': circle_sprite([(ORANGE, r + 2, 0), (RED, r, 0)]),
+            'piercing': circle_sprite([(CYAN, r + 1, 0), (WHITE, r - 1, 0)]),
+            'homing': circle_sprite([(MAGENTA, r + 1, 0), (WHITE, r - 2, 0)]),
+            'plain': circle_sprite([(YELLOW, r, 0)]),
+        }
+        self.bullet_flag_variants = [flag_variant(flags) for flags in range(BULLET_FLAGS + 1)]
+        self.enemies = {enemy_type: self.render_enemy(enemy_type) for enemy_type in ENEMY_TYPES}
+        self.hp_bars = [self.render_hp_bar(filled) for filled in range(HP_BAR_WIDTH + 1)]
+        r = projectile_radius
+        self.projectiles = {
+            True: circle_sprite([(RED, r, 0), (ORANGE, r - 3, 0)]),  # Full HP
+            False: circle_sprite([(DARK_GRAY, r, 0), (RED, r - 2, 0)]),  # Damaged
+        }
+        self.turret = [self.render_turret(step * 2 * math.pi / TURRET_ANGLE_STEPS)
+                       for step in range(TURRET_ANGLE_STEPS)]
+        self.particles = {}  # (color, size) -> sprite, filled on first use
+        if pygame.display.get_surface() is not None:
+            self.convert()
+
+    def convert(self):
+        """Match every sprite to the display's pixel format for the fast blit path"""
+        def converted(sprite):
+            surface, ox, oy = sprite
+            return surface.convert(), ox, oy
+        for sprites in (self.bullets, self.enemies, self.projectiles):
+            for key, sprite in sprites.items():
+                sprites[key] = converted(sprite)
+        self.hp_bars = [converted(sprite) for sprite in self.hp_bars]
+        self.turret = [converted(sprite) for sprite in self.turret]
+
+    def render_enemy(self, enemy_type):
+        """Enemy body with its white outline"""
+        stats = ENEMY_TYPES[enemy_type]
+        color = stats['color']
+        if enemy_type == 'circle':
+            return circle_sprite([(color, stats['radius'], 0), (WHITE, stats['radius'], 2)])
+        size = stats['size']
+        if enemy_type == 'square':
+            surface = blank_sprite(size, size)
+            pygame.draw.rect(surface, color, (0, 0, size, size))
+            pygame.draw.rect(surface, WHITE, (0, 0, size, size), 2)
+            return surface, (size + 1) // 2, (size + 1) // 2
+        # Triangle, with a margin for the outline
+        cx, cy = size // 2 + 2, int(size * 0.6) + 2
+        surface = blank_sprite(size + 4, size + 4)
+        points = [
+            (cx, cy - size * 0.6),
+            (cx - size * 0.5, cy + size * 0.4),
+            (cx + size * 0.5, cy + size * 0.4)
+        ]
+        pygame.draw.polygon(surface, color, points)
+        pygame.draw.polygon(surface, WHITE, points, 2)
+        return surface, cx, cy
+
+    def render_hp_bar(self, filled):
+        """Enemy HP bar with a given number of green pixels; drawn above the enemy"""
+        surface = pygame.Surface((HP_BAR_WIDTH, 5))
+        surface.fill(RED)
+        surface.fill(GREEN, (0, 0, filled, 5))
+        return surface, HP_BAR_WIDTH // 2, 35
+
+    def render_turret(self, angle):
+        """The whole turret, barrel pointing at angle"""
+        template = Player(0, 0)
+        center = template.radius + 16  # Room for the barrel and the shadow
+        template.x = template.y = center
+        template.angle = angle
+        surface = blank_sprite(center * 2, center * 2)
+        template.draw(surface)
+        return surface, center, center
+
+    def particle(self, color, size):
+        sprite = self.particles.get((color, size))
+        if sprite is None:
+            sprite = circle_sprite([(color, size, 0)])
+            if pygame.display.get_surface() is not None:
+                sprite = (sprite[0].convert(), sprite[1], sprite[2])
+            self.particles[(color, size)] = sprite
+        return sprite
+
+    def add_turret(self, blits, player):
+        step = round(player.angle * TURRET_ANGLE_STEPS / (2 * math.pi)) % TURRET_ANGLE_STEPS
+        surface, ox, oy = self.turret[step]
+        blits.append((surface, (int(player.x) - ox, int(player.y) - oy)))
+
+    def add_bullets(self, blits, bullets, alpha):
+        sprites = self.bullets
+        if getattr(bullets, 'vectorized', False):
+            # The variant comes from the flag bits, no per-bullet attribute reads
+            variants = self.bullet_flag_variants
+            slots, xs, ys = bullets.draw_positions(alpha)
+            for x, y, flags in zip(xs, ys, bullets.flags[slots].tolist()):
+                surface, ox, oy = sprites[variants[flags & BULLET_FLAGS]]
+                blits.append((surface, (x - ox, y - oy)))
+            return
+        for bullet in bullets:
+            x, y = interpolate(bullet, alpha)
+            surface, ox, oy = sprites[bullet_variant(bullet)]
+            blits.append((surface, (int(x) - ox, int(y) - oy)))
+
+    def add_enemies(self, blits, enemies, alpha, hp_bars=True):
+        """Enemy bodies, each followed by its HP bar when damaged and hp_bars is set"""
+        sprites = self.enemies
+        bars = self.hp_bars
+        if getattr(enemies, 'vectorized', False):
+            slots, xs, ys = enemies.draw_positions(alpha)
+            views = enemies.items
+            for slot, x, y, hp in zip(slots.tolist(), xs, ys, enemies.hp[slots].tolist()):
+                enemy = views[slot]
+                surface, ox, oy = sprites[enemy.type]
+                blits.append((surface, (x - ox, y - oy)))
+                if hp_bars and hp < enemy.max_hp:
+                    filled = max(0, min(HP_BAR_WIDTH, int(HP_BAR_WIDTH * hp / enemy.max_hp)))
+                    surface, ox, oy = bars[filled]
+                    blits.append((surface, (x - ox, y - oy)))
+            return
+        for enemy in enemies:
+            x, y = interpolate(enemy, alpha)
+            surface, ox, oy = sprites[enemy.type]
+            blits.append((surface, (int(x) - ox, int(y) - oy)))
+            if hp_bars and enemy.hp < enemy.max_hp:
+                filled = max(0, min(HP_BAR_WIDTH, int(HP_BAR_WIDTH * enemy.hp / enemy.max_hp)))
+                surface, ox, oy = bars[filled]
+                blits.append((surface, (int(x) - ox, int(y) - oy)))
+
+    def add_particles(self, blits, particles, alpha):
+        if getattr(particles, 'vectorized', False):
+            slots, xs, ys = particles.draw_positions(alpha)
+            views = particles.items
+            remaining = (1 - particles.age[slots] / particles.lifetime[slots]).tolist()
+            for slot, x, y, left in zip(slots.tolist(), xs, ys, remaining):
+                particle = views[slot]
+                size = int(particle.size * left)
+                if size > 0:
+                    surface, ox, oy = self.particle(particle.color, size)
+                    blits.append((surface, (x - ox, y - oy)))
+            return
+        for particle in particles:
+            size = int(particle.size * (1 - particle.age / particle.lifetime))
+            if size > 0:
+                x, y = interpolate(particle, alpha)
+                surface, ox, oy = self.particle(particle.color, size)
+                blits.append((surface, (int(x) - ox, int(y) - oy)))
+
+    def add_projectiles(self, blits, projectiles, alpha):
+        sprites = self.projectiles
+        if getattr(projectiles, 'vectorized', False):
+            # Positions and sprites for the whole array at once, no per-projectile attribute reads
+            slots, xs, ys = projectiles.draw_positions(alpha)
+            for x, y, healthy in zip(xs, ys, (projectiles.hp[slots] > 1).tolist()):
+                surface, ox, oy = sprites[healthy]
+                blits.append((surface, (x - ox, y - oy)))
+            return
+        for proj in projectiles:
+            x, y = interpolate(proj, alpha)
+            surface, ox, oy = sprites[proj.hp > 1]
+            blits.append((surface, (int(x) - ox, int(y) - oy)))
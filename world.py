@@ -0,0 +1,407 @@
+from constants import *
+from entities import Bullet, Enemy, Particle, BossProjectile
+
+try:
+    import numpy as np
+except ImportError:  # The array store is optional, plain pools still work without numpy
+    np = None
+
+HAS_NUMPY = np is not None
+
+# Bit flags stored per entity
+FLAG_EXPLOSIVE = 1
+FLAG_PIERCING = 2
+FLAG_HOMING = 4
+FLAG_REMOVED = 8
+
+# Enemy type codes for the 'kind' column
+# Killed rows an EntityStore keeps, as a fraction of its rows, before compact() reclaims them
+COMPACT_FRACTION = 0.25
+
+ENEMY_TYPE_CODES = {enemy_type: code for code, enemy_type in enumerate(ENEMY_TYPES)}
+
+
+class EntityPool:
+    """Entity objects with O(1) removal marking and one compaction pass per tick
+
+    Classes with a reset() method are recycled: compact() releases removed
+    entities to a free list and spawn() acquires from it before allocating.
+    """
+    vectorized = False
+
+    def __init__(self, item_class, preallocate=0):
+        self.item_class = item_class
+        self.items = []
+        self.dead_count = 0
+        self.recycle = hasattr(item_class, 'reset')
+        self.free = []
+        self.hits = 0  # spawn() served from the free list
+        self.misses = 0  # spawn() had to allocate
+        if self.recycle:
+            self.free = [item_class.__new__(item_class) for _ in range(preallocate)]
+
+    @property
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def __len__(self):
+        return len(self.items) - self.dead_count
+
+    def __iter__(self):
+        """Iterate live entities; killing or spawning while iterating is safe"""
+        return (entity for entity in self.items if not entity.removed)
+
+    def __contains__(self, entity):
+        return getattr(entity, 'pool', None) is self and not entity.removed
+
+    def spawn(self, *args):
+        """Acquire an entity, reusing a released one when possible"""
+        if self.free:
+            entity = self.free.pop()
+            entity.reset(*args)
+            self.hits += 1
+        else:
+            entity = self.item_class(*args)
+            self.misses += 1
+        self.add(entity)
+        return entity
+
+    def spawn_many(self, *columns):
+        """Spawn one entity per element of the argument columns, lists or arrays"""
+        columns = [column.tolist() if hasattr(column, 'tolist') else column for column in columns]
+        for args in zip(*columns):
+            self.spawn(*args)
+
+    def add(self, entity):
+        entity.pool = self
+        entity.removed = False
+        self.items.append(entity)
+
+    def kill(self, entity):
+        """Mark an entity as removed; it stays in memory until compact()"""
+        if not entity.removed:
+            entity.removed = True
+            self.dead_count += 1
+
+    def compact(self):
+        """Drop every removed entity in a single pass, releasing them for reuse"""
+        if self.dead_count:
+            if self.recycle:
+                self.free.extend(entity for entity in self.items if entity.removed)
+            self.items = [entity for entity in self.items if not entity.removed]
+            self.dead_count = 0
+
+    def clear(self):
+        for entity in self.items:
+            self.kill(entity)
+
+    def save_previous_positions(self):
+        """Copy every position to prev_x/prev_y for render interpolation"""
+        for entity in self.items:
+            entity.prev_x = entity.x
+            entity.prev_y = entity.y
+
+
+class DetachedRow:
+    """Holds the last values of a view after it leaves its store"""
+    def __init__(self, store, slot):
+        for name in EntityStore.COLUMNS:
+            setattr(self, name, [getattr(store, name)[slot]])
+
+
+def store_column(name):
+    """Property reading and writing one column of the view's store"""
+    def get(self):
+        return getattr(self.store, name)[self.slot]
+
+    def set(self, value):
+        getattr(self.store, name)[self.slot] = value
+
+    return property(get, set)
+
+
+class StoreView:
+    """Mixin that keeps an entity's hot fields in an EntityStore row"""
+    x = store_column('x')
+    y = store_column('y')
+    prev_x = store_column('prev_x')
+    prev_y = store_column('prev_y')
+    vel_x = store_column('vel_x')
+    vel_y = store_column('vel_y')
+    hp = store_column('hp')
+    radius = store_column('radius')
+    age = store_column('age')
+    lifetime = store_column('lifetime')
+
+    def __init__(self, store, *args):
+        self.store = store
+        self.removed = False
+        self.slot = store.reserve(self)
+        super().__init__(*args)
+
+
+class StoredEnemy(StoreView, Enemy):
+    def __init__(self, store, *args):
+        super().__init__(store, *args)
+        store.kind[self.slot] = ENEMY_TYPE_CODES[self.type]
+
+
+class StoredBullet(StoreView, Bullet):
+    def reset(self, *args):
+        super().reset(*args)
+        self.store.flags[self.slot] = ((FLAG_EXPLOSIVE if self.explosive else 0) |
+                                       (FLAG_PIERCING if self.piercing else 0) |
+                                       (FLAG_HOMING if self.homing else 0))
+
+
+class StoredParticle(StoreView, Particle):
+    pass
+
+
+class StoredBossProjectile(StoreView, BossProjectile):
+    pass
+
+
+class EntityStore:
+    """Structure-of-arrays storage for one entity population"""
+    COLUMNS = ('x', 'y', 'prev_x', 'prev_y', 'vel_x', 'vel_y', 'hp', 'radius', 'age', 'lifetime', 'kind', 'flags')
+    vectorized = True
+
+    def __init__(self, view_class, capacity=256):
+        self.view_class = view_class
+        self.items = []  # View objects, items[i] owns row i
+        self.dead = []  # Views killed since the last compact()
+        self.recycle = hasattr(view_class, 'reset')
+        self.free = []  # Released views waiting to be reused
+        self.hits = 0
+        self.misses = 0
+        self.capacity = capacity
+        self.x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.prev_x = np.zeros(capacity)
+        self.prev_y = np.zeros(capacity)
+        self.vel_x = np.zeros(capacity)
+        self.vel_y = np.zeros(capacity)
+        self.hp = np.zeros(capacity)
+        self.radius = np.zeros(capacity)
+        self.age = np.zeros(capacity)
+        self.lifetime = np.zeros(capacity)
+        self.kind = np.zeros(capacity, dtype=np.int8)
+        self.flags = np.zeros(capacity, dtype=np.uint8)
+
+    @property
+    def count(self):
+        """Rows in use, including killed rows waiting for compact()"""
+        return len(self.items)
+
+    def __len__(self):
+        return len(self.items) - len(self.dead)
+
+    def __iter__(self):
+        """Iterate live views; killing or spawning while iterating is safe"""
+        return (view for view in self.items if not view.removed)
+
+    def __getitem__(self, slot):
+        return self.items[slot]
+
+    def __contains__(self, view):
+        return getattr(view, 'store', None) is self and not view.removed
+
+    def grow(self):
+        """Double the capacity of every column"""
+        self.capacity *= 2
+        for name in self.COLUMNS:
+            old = getattr(self, name)
+            column = np.zeros(self.capacity, dtype=old.dtype)
+            column[:len(old)] = old
+            setattr(self, name, column)
+
+    def reserve(self, view):
+        """Claim a cleared row for a new view and return its slot"""
+        slot = len(self.items)
+        if slot == self.capacity:
+            self.grow()
+        for name in self.COLUMNS:
+            getattr(self, name)[slot] = 0
+        self.items.append(view)
+        return slot
+
+    @property
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def spawn(self, *args):
+        """Create a view entity backed by a new row, reusing a released view when possible"""
+        if self.free:
+            view = self.free.pop()
+            view.store = self
+            view.removed = False
+            view.slot = self.reserve(view)
+            view.reset(*args)
+            self.hits += 1
+            return view
+        self.misses += 1
+        return self.view_class(self, *args)
+
+    def spawn_many(self, x, y, vel_x, vel_y):
+        """Append one row per element of the position and velocity arrays with slice writes
+
+        Views are recycled or created without running reset() or __init__; every
+        other field comes from the view class's SPAWN_FIELDS.
+        """
+        count = len(x)
+        start = len(self.items)
+        while start + count > self.capacity:
+            self.grow()
+        rows = slice(start, start + count)
+        for name in self.COLUMNS:
+            getattr(self, name)[rows] = 0
+        self.x[rows] = self.prev_x[rows] = x
+        self.y[rows] = self.prev_y[rows] = y
+        self.vel_x[rows] = vel_x
+        self.vel_y[rows] = vel_y
+        fields = {}
+        for name, value in getattr(self.view_class, 'SPAWN_FIELDS', {}).items():
+            if name in self.COLUMNS:
+                getattr(self, name)[rows] = value
+            else:
+                fields[name] = value
+        for slot in range(start, start + count):
+            if self.free:
+                view = self.free.pop()
+                self.hits += 1
+            else:
+                view = self.view_class.__new__(self.view_class)
+                self.misses += 1
+            view.store = self
+            view.removed = False
+            view.slot = slot
+            for name, value in fields.items():
+                setattr(view, name, value)
+            self.items.append(view)
+
+    def kill(self, view):
+        """Mark a view's row as removed; the row is reclaimed by compact()"""
+        if not view.removed:
+            view.removed = True
+            self.flags[view.slot] |= FLAG_REMOVED
+            self.dead.append(view)
+
+    def kill_mask(self, mask):
+        """Kill every row where mask is true and return the killed views"""
+        killed = [self.items[slot] for slot in np.flatnonzero(mask)]
+        for view in killed:
+            self.kill(view)
+        return killed
+
+    def compact(self, force=False):
+        """Drop the killed rows in one pass, keeping the live rows in order as EntityPool does
+
+        Every array pass skips killed rows, so they are only reclaimed once they
+        make up COMPACT_FRACTION of the store, or when force is set. Moving the
+        live rows down costs a pass over them, paid once per many kills.
+        """
+        if not self.dead or (not force and len(self.dead) < len(self.items) * COMPACT_FRACTION):
+            return
+        count = len(self.items)
+        keep = self.live_mask()
+        dead = sorted(self.dead, key=lambda view: view.slot)
+        for view in dead:
+            # Released views are reused, others keep their last values readable
+            view.store = None if self.recycle else DetachedRow(self, view.slot)
+        first = dead[0].slot
+        for view in dead:
+            view.slot = 0
+        for name in self.COLUMNS:
+            column = getattr(self, name)
+            live = column[first:count][keep[first:]]
+            column[first:first + len(live)] = live
+        self.items = [view for view in self.items if not view.removed]
+        for slot in range(first, len(self.items)):
+            self.items[slot].slot = slot
+        if self.recycle:
+            self.free.extend(dead)
+        self.dead = []
+
+    def clear(self):
+        for view in self.items:
+            self.kill(view)
+
+    def live_mask(self):
+        """Mask of rows that have not been killed"""
+        return (self.flags[:len(self.items)] & FLAG_REMOVED) == 0
+
+    def draw_positions(self, alpha):
+        """Slots of the live rows and their pixel positions between the last two ticks, as lists"""
+        slots = np.flatnonzero(self.live_mask())
+        prev_x = self.prev_x[slots]
+        prev_y = self.prev_y[slots]
+        xs = (prev_x + (self.x[slots] - prev_x) * alpha).astype(int)
+        ys = (prev_y + (self.y[slots] - prev_y) * alpha).astype(int)
+        return slots, xs.tolist(), ys.tolist()
+
+    def save_previous_positions(self):
+        """Copy every position to prev_x/prev_y for render interpolation"""
+        n = len(self.items)
+        self.prev_x[:n] = self.x[:n]
+        self.prev_y[:n] = self.y[:n]
+
+    def step(self, dt, scale=None):
+        """Advance every position by its velocity"""
+        n = len(self.items)
+        if scale is None:
+            self.x[:n] += self.vel_x[:n] * dt
+            self.y[:n] += self.vel_y[:n] * dt
+        else:
+            # Scaled dt first, as Enemy.update() is handed it, so both layouts round alike
+            self.x[:n] += self.vel_x[:n] * (dt * scale)
+            self.y[:n] += self.vel_y[:n] * (dt * scale)
+
+    def age_by(self, dt):
+        """Advance every row's age"""
+        self.age[:len(self.items)] += dt
+
+    def cull_expired(self):
+        """Kill every live row that has outlived its lifetime"""
+        n = len(self.items)
+        return self.kill_mask((self.age[:n] >= self.lifetime[:n]) & self.live_mask())
+
+    def off_screen_mask(self, width=SCREEN_WIDTH, height=SCREEN_HEIGHT, margin=50):
+        """Mask of live rows outside the screen plus a margin"""
+        n = len(self.items)
+        x = self.x[:n]
+        y = self.y[:n]
+        outside = (x < -margin) | (x > width + margin) | (y < -margin) | (y > height + margin)
+        return outside & self.live_mask()
+
+    def cull_off_screen(self, width=SCREEN_WIDTH, height=SCREEN_HEIGHT, margin=50):
+        """Kill every row that has left the screen"""
+        return self.kill_mask(self.off_screen_mask(width, height, margin))
+
+    def within(self, x, y, radius):
+        """Mask of live rows closer than radius to (x, y); radius may be a per-row array"""
+        n = len(self.items)
+        dx = self.x[:n] - x
+        dy = self.y[:n] - y
+        return (dx * dx + dy * dy < radius * radius) & self.live_mask()
+
+    def flagged(self, flag):
+        """Mask of live rows with a flag bit set"""
+        return ((self.flags[:len(self.items)] & flag) != 0) & self.live_mask()
+
+
+def create_population(entity_class, use_store, preallocate=0):
+    """Create the container for one population"""
+    if use_store:
+        return EntityStore(STORE_VIEWS[entity_class], max(256, preallocate))
+    return EntityPool(entity_class, preallocate)
+
+
+STORE_VIEWS = {
+    Enemy: StoredEnemy,
+    Bullet: StoredBullet,
+    Particle: StoredParticle,
+    BossProjectile: StoredBossProjectile,
+}